@@ -0,0 +1,80 @@
+"""Filter microbenchmark: legacy per-call keyword scans vs. the compiled matcher.
+
+Usage: python benchmarks/bench_filters.py [--items 20000] [--keywords 50]
+Prints matches per second for both paths. Runs in a temporary directory so
+the bot's JSON/SQLite files are not touched.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def legacy_check(filters: dict, sub_type: str, data: dict) -> bool:
+    """check_filters as it was before compilation (lowercases and scans on every call)"""
+    if 'min_viewers' in filters and sub_type == 'kick':
+        if data.get('livestream', {}).get('viewer_count', 0) < filters['min_viewers']:
+            return False
+    if filters.get('categories') and sub_type == 'kick':
+        category_names = [c.get('name', '').lower() for c in data.get('livestream', {}).get('categories', [])]
+        if not any(cat.lower() in category_names for cat in filters['categories']):
+            return False
+    if filters.get('keywords'):
+        title = data.get('livestream', {}).get('session_title', '').lower()
+        if title and not any(keyword.lower() in title for keyword in filters['keywords']):
+            return False
+    return True
+
+def make_items(count: int, words: list) -> list:
+    rng = random.Random(42)
+    categories = ['Just Chatting', 'GTA V', 'Valorant', 'Minecraft', 'Slots']
+    return [{
+        'livestream': {
+            'session_title': ' '.join(rng.choice(words) for _ in range(8)),
+            'viewer_count': rng.randint(0, 5000),
+            'categories': [{'name': rng.choice(categories)}]
+        }
+    } for _ in range(count)]
+
+def run(label: str, check, items: list) -> float:
+    started = time.perf_counter()
+    passed = sum(1 for data in items if check(data))
+    elapsed = time.perf_counter() - started
+    rate = len(items) / elapsed
+    print(f"{label:<10} {rate:>12,.0f} matches/s  ({passed} passed)")
+    return rate
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--keywords', type=int, default=50)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench_filters_'))
+    sys.path.insert(0, REPO)
+    import bot
+
+    vocabulary = [f"word{i}" for i in range(500)] + ['turnuva', 'final', 'tekrar', 'özel', 'yayın']
+    filters = {
+        'min_viewers': 100,
+        'categories': ['Just Chatting', 'GTA V', 'Valorant'],
+        'keywords': random.Random(1).sample(vocabulary, args.keywords)
+    }
+    items = make_items(args.items, vocabulary)
+    sub = {'id': 'bench', 'type': 'kick'}
+    bot.config.bot_config.setdefault('filters', {})['bench'] = filters
+
+    print(f"{args.items} items, {args.keywords} keywords")
+    legacy = run('legacy', lambda data: legacy_check(filters, 'kick', data), items)
+    compiled = run('compiled', lambda data: bot.check_filters(sub, data), items)
+    print(f"speedup    {compiled / legacy:.2f}x")
+
+    filters['expression'] = 'turnuva AND NOT tekrar AND (viewers>=1000 OR category:"just chatting")'
+    bot._compiled_filters.clear()
+    run('expression', lambda data: bot.check_filters(sub, data), items)
+
+if __name__ == '__main__':
+    main()
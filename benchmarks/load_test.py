@@ -0,0 +1,418 @@
+"""Offline load test: full check cycles against local stand-ins for every upstream.
+
+Usage: python benchmarks/load_test.py [--scales 10,1000,10000] [--cycles 3]
+                                      [--latency-ms 50] [--change-rate 0.1]
+                                      [--feed-entries 15] [--entry-bytes 400]
+                                      [--subs-per-source 5] [--env KEY=VALUE ...]
+                                      [--output result.json] [--compare baseline.json]
+
+A fake HTTP server (separate process) serves synthetic YouTube/RSS/Atom feeds
+and Kick channel JSON with the given size, latency and change rate (the chance
+that a source has new content on each request). Twitter is a stubbed tweepy
+client and Discord channels only record what they are sent.
+
+Every scale runs in a fresh process and temporary directory, so peak RSS and
+the bot's JSON/SQLite files belong to that run alone. All sources are made due
+on every cycle (POLL_FLOOR_*/POLL_CEILING_* = 0). Results are written as JSON;
+--compare prints the change of every summary number against an earlier result.
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Share of subscriptions per source type
+TYPE_MIX = (('kick', 0.3), ('youtube', 0.3), ('rss', 0.25), ('twitter', 0.15))
+
+# Bot settings for the run; --env overrides them
+BOT_ENV = {
+    'DISCORD_TOKEN': 'load-test',
+    'TWITTER_BEARER_TOKEN': 'load-test',
+    'TEST_MODE': 'false',
+    'KICK_FETCH_MODE': 'http',  # Never start Firefox
+    'KICK_REQUESTS_PER_SECOND': '0',  # The fake server is not kick.com
+    'METRICS_PORT': '0',
+}
+for _source_type, _ in TYPE_MIX:
+    BOT_ENV[f'POLL_FLOOR_{_source_type.upper()}'] = '0'
+    BOT_ENV[f'POLL_CEILING_{_source_type.upper()}'] = '0'
+
+# ==================== FAKE UPSTREAM SERVER ====================
+def feed_document(kind: str, name: str, version: int, entries: int, entry_bytes: int) -> str:
+    """Synthetic feed whose newest entry is `version`"""
+    filler = ('lorem ipsum dolor sit amet ' * (entry_bytes // 27 + 1))[:entry_bytes]
+    items = []
+    for n in range(version, max(version - entries, 0), -1):
+        published = datetime.fromtimestamp(1_700_000_000 + n * 60, timezone.utc)
+        if kind == 'rss':
+            items.append(
+                f"<item><title>{name} post {n}</title><link>https://example.com/{name}/{n}</link>"
+                f"<guid>{name}-{n}</guid><pubDate>{format_datetime(published)}</pubDate>"
+                f"<description>{filler}</description></item>"
+            )
+        else:
+            items.append(
+                f"<entry><id>yt:video:{name}-{n}</id><yt:videoId>{name}-{n}</yt:videoId>"
+                f"<title>{name} video {n}</title><link rel=\"alternate\" href=\"https://www.youtube.com/watch?v={name}-{n}\"/>"
+                f"<author><name>{name}</name></author><published>{published.isoformat()}</published>"
+                f"<media:group><media:thumbnail url=\"https://i.ytimg.com/vi/{name}-{n}/hqdefault.jpg\"/>"
+                f"<media:description>{filler}</media:description></media:group></entry>"
+            )
+    if kind == 'rss':
+        return (f"<?xml version=\"1.0\" encoding=\"UTF-8\"?><rss version=\"2.0\"><channel>"
+                f"<title>{name}</title>{''.join(items)}</channel></rss>")
+    return ("<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+            "<feed xmlns=\"http://www.w3.org/2005/Atom\" xmlns:yt=\"http://www.youtube.com/xml/schemas/2015\" "
+            f"xmlns:media=\"http://search.yahoo.com/mrss/\"><title>{name}</title>{''.join(items)}</feed>")
+
+def kick_document(name: str, version: int) -> dict:
+    """Kick channel JSON, live on odd versions"""
+    livestream = None
+    if version % 2:
+        livestream = {
+            'session_title': f"{name} stream {version}",
+            'viewer_count': 100 + version,
+            'categories': [{'name': 'Just Chatting'}],
+            'thumbnail': {'url': f"https://example.com/{name}/{version}.jpg"}
+        }
+    return {'slug': name, 'user': {'username': name, 'profile_pic': None}, 'livestream': livestream}
+
+def run_server(ready, options: dict):
+    from aiohttp import web
+
+    rng = random.Random(options['seed'])
+    versions = {}  # source: newest version
+    counters = {'requests': 0, 'bytes': 0, 'not_modified': 0}
+
+    def next_version(key: str) -> int:
+        version = versions.get(key)
+        if version is None:
+            version = versions[key] = options['feed_entries'] + 1
+        elif rng.random() < options['change_rate']:
+            version = versions[key] = version + 1
+        return version
+
+    async def delay():
+        if options['latency']:
+            await asyncio.sleep(options['latency'] * rng.uniform(0.5, 1.5))
+
+    def respond(request, body: bytes, content_type: str, version: int):
+        counters['requests'] += 1
+        etag = f'"{version}"'
+        if request.headers.get('If-None-Match') == etag:
+            counters['not_modified'] += 1
+            return web.Response(status=304, headers={'ETag': etag})
+        counters['bytes'] += len(body)
+        return web.Response(body=body, headers={'Content-Type': content_type, 'ETag': etag})
+
+    async def feed(request):
+        await delay()
+        kind, name = request.match_info['kind'], request.match_info['name']
+        version = next_version(f"{kind}:{name}")
+        body = feed_document(kind, name, version, options['feed_entries'], options['entry_bytes']).encode('utf-8')
+        return respond(request, body, 'application/xml; charset=utf-8', version)
+
+    async def kick(request):
+        await delay()
+        name = request.match_info['name']
+        version = next_version(f"kick:{name}")
+        body = json.dumps(kick_document(name, version)).encode('utf-8')
+        return respond(request, body, 'application/json', version)
+
+    async def read_stats(request):
+        snapshot = dict(counters)
+        for key in counters:
+            counters[key] = 0
+        return web.json_response(snapshot)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/feed/{kind}/{name}', feed)
+        app.router.add_get('/kick/{name}', kick)
+        app.router.add_get('/_stats', read_stats)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        ready.put(site._server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+# ==================== STAND-INS ====================
+class FakeResponse:
+    """What tweepy returns with return_type=requests.Response"""
+    def __init__(self, payload: dict):
+        self._payload = payload
+        self.headers = {'x-rate-limit-remaining': '900', 'x-rate-limit-reset': str(int(time.time()) + 900)}
+
+    def json(self):
+        return self._payload
+
+class StubTwitterClient:
+    """get_users / get_users_tweets with the server's latency and change rate (called from threads)"""
+    def __init__(self, options: dict):
+        self.options = options
+        self.rng = random.Random(options['seed'] + 1)
+        self.latest = {}  # user id: newest tweet id
+        self.requests = 0
+
+    def _delay(self):
+        self.requests += 1
+        if self.options['latency']:
+            time.sleep(self.options['latency'] * self.rng.uniform(0.5, 1.5))
+
+    def get_users(self, usernames, user_fields=None):
+        self._delay()
+        return FakeResponse({'data': [
+            {'id': str(1000 + int(name.rsplit('_', 1)[1])), 'username': name, 'name': name, 'profile_image_url': None}
+            for name in usernames
+        ]})
+
+    def get_users_tweets(self, id, max_results=5, tweet_fields=None, since_id=None):
+        self._delay()
+        user_id = int(id)
+        newest = self.latest.setdefault(user_id, user_id * 1000 + 5)
+        if self.rng.random() < self.options['change_rate']:
+            newest = self.latest[user_id] = newest + 1
+        ids = [n for n in range(newest, newest - max_results, -1) if since_id is None or n > int(since_id)]
+        return FakeResponse({'data': [
+            {'id': str(n), 'text': f"tweet {n}", 'created_at': '2024-01-01T12:00:00.000Z', 'edit_history_tweet_ids': [str(n)]}
+            for n in ids
+        ]})
+
+class FakeChannel:
+    """Discord channel that only records sends"""
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.mention = f"<#{channel_id}>"
+        self.messages = 0
+        self.embeds = 0
+
+    async def send(self, content=None, embeds=None, **kwargs):
+        self.messages += 1
+        self.embeds += len(embeds or [])
+
+def make_subscriptions(count: int, subs_per_source: int, base_url: str, scale_tag: str) -> list:
+    """`count` subscriptions following count / subs_per_source sources, split by TYPE_MIX"""
+    subs = []
+    for source_type, share in TYPE_MIX:
+        for n in range(round(count * share)):
+            name = f"{scale_tag}_{n // subs_per_source}"
+            channel_id = 10_000 + n % 500
+            sub = {'type': source_type, 'discord_channel_id': channel_id, 'guild_id': 1 + channel_id % 50}
+            if source_type == 'kick':
+                sub.update({'id': f"kick_{name}_{n}", 'username': name, 'was_live': False})
+            elif source_type == 'twitter':
+                sub.update({'id': f"twitter_{name}_{n}", 'username': name, 'last_tweet_id': None})
+            else:
+                kind = 'atom' if source_type == 'youtube' else 'rss'
+                url = f"{base_url}/feed/{kind}/{name}"
+                sub.update({'id': f"{url}#{n}", 'url': url, 'last_entry_id': None})
+            subs.append(sub)
+    return subs[:count]
+
+# ==================== BOT RUN ====================
+def run_scale(result_queue, count: int, port: int, options: dict, env: dict):
+    """One scale in a fresh process: import the bot, run the cycles, report JSON"""
+    os.environ.update(env)
+    os.chdir(tempfile.mkdtemp(prefix='load_test_'))
+    base_url = f"http://127.0.0.1:{port}"
+
+    subs = make_subscriptions(count, options['subs_per_source'], base_url, f"s{count}")
+    with open('subscriptions.json', 'w', encoding='utf-8') as f:
+        json.dump(subs, f)
+
+    log = sys.stderr if options['verbose'] else open(os.devnull, 'w')
+    sys.stdout = log  # The bot logs with print
+    sys.path.insert(0, REPO)
+    import aiohttp
+    import bot
+
+    bot.KICK_API_URL = base_url + "/kick/{username}"
+    twitter = StubTwitterClient(options)
+    bot.twitter_client.client = twitter
+    channels = {}
+    bot.bot.get_channel = lambda channel_id: channels.setdefault(channel_id, FakeChannel(channel_id))
+
+    async def ready():
+        return None
+    bot.bot.wait_until_ready = ready
+
+    async def server_stats(session):
+        async with session.get(base_url + '/_stats') as resp:
+            return await resp.json()
+
+    async def drain():
+        while bot.notification_dispatcher.pending():
+            await asyncio.sleep(0.01)
+
+    async def main():
+        registry = bot.get_registry()
+        sources = {}
+        for key, source_type in registry.source_types().items():
+            sources[source_type] = sources.get(source_type, 0) + 1
+
+        cycles = []
+        async with aiohttp.ClientSession() as control:
+            await server_stats(control)
+            for cycle in range(options['cycles'] + 1):
+                http_before = bot.http_sessions.stats['requests']
+                twitter_before = twitter.requests
+                sent_before = sum(c.embeds for c in channels.values())
+                messages_before = sum(c.messages for c in channels.values())
+
+                cpu_started = time.process_time()
+                started = time.perf_counter()
+                await bot.check_feeds.coro()
+                await bot.cycle_runner.wait()
+                elapsed = time.perf_counter() - started
+                cpu = time.process_time() - cpu_started
+
+                drain_started = time.perf_counter()
+                await drain()
+                drain_elapsed = time.perf_counter() - drain_started
+                upstream = await server_stats(control)
+
+                cycles.append({
+                    'cycle': cycle,
+                    'warmup': cycle == 0,
+                    'latency_s': round(elapsed, 4),
+                    'cpu_s': round(cpu, 4),
+                    'drain_s': round(drain_elapsed, 4),
+                    'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+                    'http_requests': bot.http_sessions.stats['requests'] - http_before,
+                    'not_modified': upstream['not_modified'],
+                    'bytes': upstream['bytes'],
+                    'twitter_requests': twitter.requests - twitter_before,
+                    'notifications': sum(c.embeds for c in channels.values()) - sent_before,
+                    'messages': sum(c.messages for c in channels.values()) - messages_before,
+                })
+
+        # The exported gauges must reflect the loaded subscriptions
+        rendered = bot.metrics.render()
+        for source_type in sources:
+            if f'notifier_subscriptions{{type="{source_type}"}}' not in rendered:
+                raise RuntimeError(f"/metrics has no subscription gauge for {source_type}")
+
+        await bot.notification_dispatcher.close()
+        await bot.http_sessions.close()
+        await bot.state_writer.flush()
+        bot.subscription_store.close()
+        return {'subscriptions': len(registry), 'sources': sources, 'cycles': cycles}
+
+    result = asyncio.run(main())
+    measured = [c for c in result['cycles'] if not c['warmup']] or result['cycles']
+    latencies = sorted(c['latency_s'] for c in measured)
+    result['summary'] = {
+        'latency_p50_s': round(statistics.median(latencies), 4),
+        'latency_max_s': latencies[-1],
+        'cpu_mean_s': round(statistics.mean(c['cpu_s'] for c in measured), 4),
+        'peak_rss_mb': max(c['peak_rss_mb'] for c in result['cycles']),
+        'requests_per_cycle': round(statistics.mean(c['http_requests'] + c['twitter_requests'] for c in measured), 1),
+        'bytes_per_cycle': round(statistics.mean(c['bytes'] for c in measured)),
+        'notifications_per_cycle': round(statistics.mean(c['notifications'] for c in measured), 1),
+    }
+    result_queue.put(result)
+
+# ==================== REPORT ====================
+def compare(current: dict, baseline: dict):
+    old_runs = {run['subscriptions']: run for run in baseline.get('runs', [])}
+    for run in current['runs']:
+        old = old_runs.get(run['subscriptions'])
+        if old is None:
+            continue
+        print(f"{run['subscriptions']} subscriptions", file=sys.stderr)
+        for key, value in run['summary'].items():
+            before = old['summary'].get(key)
+            change = f"{(value - before) / before * 100:+.1f}%" if before else 'n/a'
+            print(f"  {key:<24} {before!s:>12} -> {value!s:<12} {change}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', default='10,1000,10000')
+    parser.add_argument('--cycles', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=50)
+    parser.add_argument('--change-rate', type=float, default=0.1)
+    parser.add_argument('--feed-entries', type=int, default=15)
+    parser.add_argument('--entry-bytes', type=int, default=400)
+    parser.add_argument('--subs-per-source', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE')
+    parser.add_argument('--output')
+    parser.add_argument('--compare')
+    parser.add_argument('--verbose', action='store_true', help='show the bot log on stderr')
+    args = parser.parse_args()
+
+    options = {
+        'latency': args.latency_ms / 1000,
+        'change_rate': args.change_rate,
+        'feed_entries': args.feed_entries,
+        'entry_bytes': args.entry_bytes,
+        'subs_per_source': max(1, args.subs_per_source),
+        'cycles': args.cycles,
+        'seed': args.seed,
+        'verbose': args.verbose,
+    }
+    env = dict(BOT_ENV)
+    env.update(item.split('=', 1) for item in args.env)
+
+    ctx = multiprocessing.get_context('spawn')
+    ready = ctx.Queue()
+    server = ctx.Process(target=run_server, args=(ready, options), daemon=True)
+    server.start()
+    port = ready.get(timeout=30)
+
+    runs = []
+    try:
+        for count in (int(s) for s in args.scales.split(',') if s.strip()):
+            print(f"{count} subscriptions...", file=sys.stderr)
+            results = ctx.Queue()
+            worker = ctx.Process(target=run_scale, args=(results, count, port, options, env))
+            worker.start()
+            while True:
+                try:
+                    result = results.get(timeout=1)
+                    break
+                except queue.Empty:
+                    if not worker.is_alive():
+                        sys.exit(f"{count} subscriptions: run failed (exit code {worker.exitcode})")
+            worker.join()
+            print(f"  {json.dumps(result['summary'])}", file=sys.stderr)
+            runs.append(result)
+    finally:
+        server.terminate()
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'options': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'verbose')},
+        'env': env,
+        'runs': runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(report, json.load(f))
+
+if __name__ == '__main__':
+    main()
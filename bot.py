@@ -1,30 +1,180 @@
+import time as time_module
+STARTUP_STARTED = time_module.perf_counter()
+
 import discord
 from discord.ext import tasks, commands
 import os
+import sys
 import json
-import feedparser
+import hashlib
+import importlib.util
 import aiohttp
+from aiohttp import web
 from dotenv import load_dotenv
 from datetime import datetime
 import re
-from selenium import webdriver
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import string
+import calendar
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+import sqlite3
+import threading
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import asyncio
+import heapq
+import bisect
+import itertools
+import random
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from types import SimpleNamespace
+from yarl import URL
 from typing import Optional, Dict, List
-import time as time_module
+from feed_fallback import IMG_SRC_RE, parse_feed_document
 
-# Optional: Twitter support
+# Optional: Twitter support (imported by tweepy_api() once an account is checked)
+TWITTER_AVAILABLE = importlib.util.find_spec('tweepy') is not None
+if not TWITTER_AVAILABLE:
+    print("⚠️ Tweepy not installed - Twitter features disabled")
+tweepy = None
+requests = None  # tweepy dependency; raw responses carry the rate limit headers
+
+# Optional: voice support (PyNaCl), checked once
 try:
-    import tweepy
-    TWITTER_AVAILABLE = True
+    import nacl
+    VOICE_AVAILABLE = True
 except ImportError:
-    TWITTER_AVAILABLE = False
-    print("⚠️ Tweepy not installed - Twitter features disabled")
+    VOICE_AVAILABLE = False
+
+# ==================== LAZY IMPORTS ====================
+# Selenium, feedparser and tweepy are only needed once a source of that type is checked
+_selenium = None
+
+def selenium_api() -> SimpleNamespace:
+    """Selenium, imported the first time a browser is needed"""
+    global _selenium
+    if _selenium is None:
+        from selenium import webdriver
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        from selenium.webdriver.firefox.options import Options as FirefoxOptions
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import WebDriverException, TimeoutException
+        _selenium = SimpleNamespace(
+            webdriver=webdriver, FirefoxService=FirefoxService, FirefoxOptions=FirefoxOptions, By=By,
+            WebDriverWait=WebDriverWait, EC=EC, WebDriverException=WebDriverException, TimeoutException=TimeoutException
+        )
+    return _selenium
+
+def tweepy_api():
+    """The tweepy module, imported when the first Twitter account is checked (None if not installed)"""
+    global tweepy, requests
+    if tweepy is None and TWITTER_AVAILABLE:
+        import tweepy as tweepy_module
+        import requests as requests_module
+        tweepy, requests = tweepy_module, requests_module
+    return tweepy
+
+# ==================== STARTUP PROFILE ====================
+class StartupProfile:
+    """Wall time of every startup phase, printed once the bot is ready"""
+    def __init__(self, started: float):
+        self.started = started
+        self._last = started
+        self.phases = []  # (phase, seconds)
+    
+    def mark(self, phase: str):
+        now = time_module.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+    
+    def report(self):
+        steps = ' | '.join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases)
+        print(f"⏱️ Başlangıç: {steps} | toplam {self._last - self.started:.2f}s")
+
+startup_profile = StartupProfile(STARTUP_STARTED)
+startup_profile.mark('imports')
+
+# ==================== ASYNC JSON WRITER ====================
+class DebouncedJsonWriter:
+    """Coalesces saves of one JSON file and writes it atomically off the event loop"""
+    def __init__(self, path: str, window: float, **dump_kwargs):
+        self.path = path
+        self.window = window
+        self.dump_kwargs = dump_kwargs
+        self._snapshot = None  # Callable returning the data to write
+        self._task = None
+        self._lock = asyncio.Lock()
+        self.requests = 0
+        self.writes = 0
+        self.loop_blocking = 0.0  # Seconds spent serializing on the event loop
+        self.max_loop_blocking = 0.0
+    
+    def schedule(self, snapshot):
+        """Request a save; everything requested within the window becomes one write"""
+        self.requests += 1
+        self._snapshot = snapshot
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Before the bot starts (first run defaults) there is no loop to defer to
+            self.write_now()
+            return
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._delayed_flush())
+    
+    async def _delayed_flush(self):
+        # Saves requested while a write was in flight still need their own write
+        while True:
+            await asyncio.sleep(self.window)
+            await self.flush()
+            if self._snapshot is None:
+                return
+    
+    def _serialize(self) -> Optional[str]:
+        snapshot, self._snapshot = self._snapshot, None
+        if snapshot is None:
+            return None
+        started = time_module.perf_counter()
+        payload = json.dumps(snapshot(), **self.dump_kwargs)
+        blocked = time_module.perf_counter() - started
+        self.loop_blocking += blocked
+        self.max_loop_blocking = max(self.max_loop_blocking, blocked)
+        return payload
+    
+    def _write(self, payload: str):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.writes += 1
+    
+    async def flush(self):
+        async with self._lock:
+            payload = self._serialize()
+            if payload is not None:
+                await asyncio.to_thread(self._write, payload)
+    
+    def write_now(self):
+        payload = self._serialize()
+        if payload is not None:
+            self._write(payload)
+    
+    async def close(self):
+        """Write any pending change immediately (shutdown)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        await self.flush()
+    
+    def describe(self) -> str:
+        return (f"{self.requests} istek → {self.writes} yazma, "
+                f"loop blokaj {self.loop_blocking * 1000:.1f}ms (max {self.max_loop_blocking * 1000:.1f}ms)")
 
 # ==================== CONFIG SYSTEM ====================
 class Config:
@@ -32,20 +182,91 @@ class Config:
         load_dotenv()
         self.TOKEN = os.getenv('DISCORD_TOKEN')
         self.TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')
+        self.TWITTER_ID_CACHE_FILE = os.getenv('TWITTER_ID_CACHE_FILE', 'twitter_ids.json')  # handle -> user id
+        self.TWITTER_ID_TTL = int(os.getenv('TWITTER_ID_TTL', str(7 * 24 * 3600)))  # Seconds before a handle is resolved again
+        self.TWITTER_CONCURRENCY = int(os.getenv('TWITTER_CONCURRENCY', '3'))  # Timelines fetched in parallel
         self.CHECK_INTERVAL = int(os.getenv('CHECK_INTERVAL_SECONDS', '60'))  # 30'dan 60'a çıkarıldı
-        self.SUBS_FILE = os.getenv('SUBS_FILE', 'subscriptions.json')
+        self.SUBS_FILE = os.getenv('SUBS_FILE', 'subscriptions.json')  # Legacy file, imported into the database once
+        self.SUBS_DB_FILE = os.getenv('SUBS_DB_FILE', 'subscriptions.db')
+        self.STATE_FLUSH_INTERVAL = int(os.getenv('STATE_FLUSH_INTERVAL', '30'))  # Max seconds a cursor change stays in memory
         self.CONFIG_FILE = os.getenv('CONFIG_FILE', 'bot_config.json')
-        self.STATS_FILE = os.getenv('STATS_FILE', 'bot_stats.json')
+        self.STATS_FILE = os.getenv('STATS_FILE', 'bot_stats.json')  # Counters and hourly/daily rollups
+        self.STATS_LOG_FILE = os.getenv('STATS_LOG_FILE', 'bot_stats.log')  # Append-only notification rows
+        self.FEED_CACHE_FILE = os.getenv('FEED_CACHE_FILE', 'feed_cache.json')  # ETag/Last-Modified per feed
+        self.SEEN_ENTRIES_FILE = os.getenv('SEEN_ENTRIES_FILE', 'seen_entries.json')  # Feed entry ids already handled
+        self.SEEN_ENTRIES_PER_SOURCE = int(os.getenv('SEEN_ENTRIES_PER_SOURCE', '200'))  # LRU size per feed
+        self.FEED_MAX_NEW_ENTRIES = int(os.getenv('FEED_MAX_NEW_ENTRIES', '10'))  # Notifications per feed and poll
+        self.FEED_PARSE_WORKERS = int(os.getenv('FEED_PARSE_WORKERS', '0'))  # feedparser processes (0 = thread only)
+        self.FEED_PARSE_POOL_THRESHOLD = int(os.getenv('FEED_PARSE_POOL_THRESHOLD', '262144'))  # Bytes; smaller documents stay in a thread
         self.NOTIFICATION_SOUND = os.getenv('NOTIFICATION_SOUND', 'notif.mp3')
         self.DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'tr')
         self.TEST_MODE = os.getenv('TEST_MODE', 'false').lower() == 'true'
         
+        # Adaptive polling: every source gets its own interval between a per-type floor and ceiling
+        self.SCHEDULER_TICK = int(os.getenv('SCHEDULER_TICK_SECONDS', '5'))  # How often due sources are picked up
+        self.POLL_IDLE_BACKOFF = float(os.getenv('POLL_IDLE_BACKOFF', '1.5'))  # Interval multiplier when nothing changed
+        self.POLL_ERROR_BACKOFF = float(os.getenv('POLL_ERROR_BACKOFF', '2'))  # Interval multiplier after a failure
+        self.POLL_JITTER = float(os.getenv('POLL_JITTER', '0.1'))  # +/- fraction added to every interval
+        self.POLL_LIMITS = {
+            source_type: (
+                int(os.getenv(f'POLL_FLOOR_{source_type.upper()}', floor)),
+                int(os.getenv(f'POLL_CEILING_{source_type.upper()}', ceiling))
+            )
+            for source_type, (floor, ceiling) in {
+                'kick': (30, 120),
+                'youtube': (60, 900),
+                'rss': (60, 1800),
+                'twitter': (60, 900),
+            }.items()
+        }
+        
         # Network optimization settings
         self.MAX_CONCURRENT_CHECKS = int(os.getenv('MAX_CONCURRENT_CHECKS', '3'))  # Max parallel requests
         self.REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '8'))  # Reduced from 10
         self.SELENIUM_TIMEOUT = int(os.getenv('SELENIUM_TIMEOUT', '6'))  # Reduced from 8
+        self.SOURCE_TIMEOUT = float(os.getenv('SOURCE_TIMEOUT', '30'))  # One source may take this long, then it is cancelled
+        self.CYCLE_TIMEOUT = float(os.getenv('CYCLE_TIMEOUT', '120'))  # One Kick/feed/Twitter run, the rest carries over
+        
+        # Shared HTTP connection pool (lives as long as the bot)
+        self.HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '20'))  # Open connections in total
+        self.HTTP_POOL_LIMIT_PER_HOST = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '4'))
+        self.HTTP_DNS_CACHE_TTL = int(os.getenv('HTTP_DNS_CACHE_TTL', '300'))  # Seconds
+        self.HTTP_KEEPALIVE_TIMEOUT = int(os.getenv('HTTP_KEEPALIVE_TIMEOUT', '90'))  # Idle connection lifetime
+        
+        # Kick polling concurrency
+        self.KICK_WORKERS = int(os.getenv('KICK_WORKERS', '3'))  # Channels fetched in parallel
+        self.KICK_REQUESTS_PER_SECOND = float(os.getenv('KICK_REQUESTS_PER_SECOND', '5'))  # Shared limit for kick.com
+        
+        # Kick fetch path: auto (HTTP, Selenium only when blocked), http or selenium
+        self.KICK_FETCH_MODE = os.getenv('KICK_FETCH_MODE', 'auto').lower()
+        self.KICK_HTTP_BLOCK_COOLDOWN = int(os.getenv('KICK_HTTP_BLOCK_COOLDOWN', '300'))  # Seconds to prefer Selenium after a block
+        
+        # Kick browser session pool
+        self.FIREFOX_BINARY_PATH = os.getenv('FIREFOX_BINARY_PATH', '/usr/lib/firefox-esr/firefox-esr')
+        self.KICK_DRIVER_POOL_SIZE = int(os.getenv('KICK_DRIVER_POOL_SIZE', str(self.KICK_WORKERS)))  # Warm Firefox sessions
+        self.KICK_DRIVER_MAX_REQUESTS = int(os.getenv('KICK_DRIVER_MAX_REQUESTS', '200'))  # Recycle after N page loads
+        self.KICK_DRIVER_MAX_MEMORY_MB = int(os.getenv('KICK_DRIVER_MAX_MEMORY_MB', '600'))  # Recycle above this RSS (0 = off)
+        
+        # Config and stats saves within this window are merged into one background write
+        self.SAVE_DEBOUNCE_SECONDS = float(os.getenv('SAVE_DEBOUNCE_SECONDS', '2'))
+        self.writer = DebouncedJsonWriter(self.CONFIG_FILE, self.SAVE_DEBOUNCE_SECONDS, indent=2, ensure_ascii=False)
+        
+        # Outgoing notification delivery (independent of polling)
+        self.DISPATCH_QUEUE_SIZE = int(os.getenv('DISPATCH_QUEUE_SIZE', '1000'))  # Pending notifications before checkers wait
+        self.DISPATCH_WORKERS = int(os.getenv('DISPATCH_WORKERS', '4'))  # Channels delivered to in parallel
+        self.DISPATCH_BATCH_WINDOW = float(os.getenv('DISPATCH_BATCH_WINDOW', '1'))  # Seconds to gather items for one message
+        self.DISPATCH_MAX_RETRIES = int(os.getenv('DISPATCH_MAX_RETRIES', '5'))  # On 429 / 5xx / network errors
+        
+        # Values kept between restarts (geckodriver path, command schema hash)
+        self.RUNTIME_CACHE_FILE = os.getenv('RUNTIME_CACHE_FILE', 'runtime_cache.json')
+        self.FORCE_COMMAND_SYNC = os.getenv('FORCE_COMMAND_SYNC', 'false').lower() == 'true'  # Sync slash commands on every start
+        
+        # Local Prometheus-style /metrics endpoint (0 = off)
+        self.METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+        self.METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')  # Keep it local; put a proxy in front if needed
         
         # Load bot config
+        self._listeners = []  # Called after every bot_config change
         self.bot_config = self.load_bot_config()
         
     def load_bot_config(self) -> dict:
@@ -68,14 +289,51 @@ class Config:
         self.save_bot_config(default_config)
         return default_config
     
-    def save_bot_config(self, config: dict):
-        """Save bot configuration"""
-        with open(self.CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+    def save_bot_config(self, config: dict, changed: Optional[str] = None):
+        """Save bot configuration (debounced, written in the background).
+        
+        `changed` names the bot_config key that was modified; None notifies every listener."""
         self.bot_config = config
+        for key, listener in self._listeners:
+            if changed is None or key is None or key == changed:
+                listener()
+        self.writer.schedule(lambda: self.bot_config)
+    
+    def add_listener(self, callback, key: Optional[str] = None):
+        """Register a callback for changes of one bot_config key (None = any change)"""
+        self._listeners.append((key, callback))
 
 config = Config()
 
+# ==================== RUNTIME CACHE ====================
+class RuntimeCache:
+    """Small values worth keeping between restarts, read on first use"""
+    def __init__(self, path: str):
+        self.path = path
+        self._data = None
+        self.writer = DebouncedJsonWriter(path, config.SAVE_DEBOUNCE_SECONDS, indent=2)
+    
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        self._data = json.load(f)
+                except:
+                    pass
+        return self._data
+    
+    def get(self, key: str, default=None):
+        return self.data.get(key, default)
+    
+    def set(self, key: str, value):
+        self.data[key] = value
+        self.writer.schedule(lambda: dict(self.data))
+
+runtime_cache = RuntimeCache(config.RUNTIME_CACHE_FILE)
+
 # ==================== LANGUAGE SYSTEM ====================
 TRANSLATIONS = {
     'tr': {
@@ -136,66 +394,381 @@ TRANSLATIONS = {
     }
 }
 
+_guild_languages = {}  # guild_id: language code, cleared when /dil changes it
+config.add_listener(_guild_languages.clear, 'languages')
+
+def guild_language(guild_id: int) -> str:
+    lang = _guild_languages.get(guild_id)
+    if lang is None:
+        lang = config.bot_config.get('languages', {}).get(str(guild_id), config.DEFAULT_LANGUAGE)
+        if lang not in TRANSLATIONS:
+            lang = 'tr'
+        _guild_languages[guild_id] = lang
+    return lang
+
 def get_text(key: str, guild_id: int, **kwargs) -> str:
     """Get translated text"""
-    lang = config.bot_config.get('languages', {}).get(str(guild_id), config.DEFAULT_LANGUAGE)
-    text = TRANSLATIONS.get(lang, TRANSLATIONS['tr']).get(key, key)
+    text = TRANSLATIONS[guild_language(guild_id)].get(key, key)
     return text.format(**kwargs) if kwargs else text
 
 # ==================== STATS SYSTEM ====================
+class AppendOnlyLog:
+    """Buffers compact rows and appends them to a JSON-lines file in the background"""
+    def __init__(self, path: str, window: float):
+        self.path = path
+        self.window = window
+        self._pending = []
+        self._task = None
+        self._lock = asyncio.Lock()
+    
+    def append(self, row: list):
+        self._pending.append(row)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(self._take())
+            return
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._delayed_flush())
+    
+    def _take(self) -> str:
+        rows, self._pending = self._pending, []
+        return ''.join(json.dumps(row, ensure_ascii=False, separators=(',', ':')) + '\n' for row in rows)
+    
+    def _write(self, payload: str):
+        if payload:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+    
+    async def _delayed_flush(self):
+        # Rows appended while a write was in flight still need their own write
+        while True:
+            await asyncio.sleep(self.window)
+            await self.flush()
+            if not self._pending:
+                return
+    
+    async def flush(self):
+        async with self._lock:
+            payload = self._take()
+            if payload:
+                await asyncio.to_thread(self._write, payload)
+    
+    async def close(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        await self.flush()
+
 class Stats:
+    """Notification counters with hourly/daily rollups per guild and type"""
+    HOURLY_RETENTION = 31 * 24  # Hours of hourly buckets kept (covers /ozet 720)
+    DAILY_RETENTION = 400  # Days of daily buckets kept
+    RECENT_SIZE = 20
+    
     def __init__(self):
-        self.data = self.load_stats()
+        self._data = None  # Read on first use, not at import
         self.start_time = time_module.time()
+        self.writer = DebouncedJsonWriter(config.STATS_FILE, config.SAVE_DEBOUNCE_SECONDS, ensure_ascii=False)
+        self.log = AppendOnlyLog(config.STATS_LOG_FILE, config.SAVE_DEBOUNCE_SECONDS)
+    
+    @property
+    def data(self) -> dict:
+        if self._data is None:
+            self._data = self.load_stats()
+        return self._data
+    
+    @staticmethod
+    def _int_keys(buckets: dict) -> dict:
+        # JSON turns int keys into strings: {bucket: {guild: {type_id: count}}}
+        return {
+            int(bucket): {int(guild): {int(t): n for t, n in types.items()} for guild, types in guilds.items()}
+            for bucket, guilds in buckets.items()
+        }
     
     def load_stats(self) -> dict:
+        data = None
         if os.path.exists(config.STATS_FILE):
             try:
                 with open(config.STATS_FILE, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    data = json.load(f)
             except:
                 pass
-        return {
+        
+        if data and data.get('version') == 2:
+            data['hourly'] = self._int_keys(data.get('hourly', {}))
+            data['daily'] = self._int_keys(data.get('daily', {}))
+            return data
+        
+        fresh = {
+            'version': 2,
             'total_notifications': 0,
             'notifications_by_type': {},
-            'history': []  # {timestamp, type, title, channel_id}
+            'types': [],  # Interned notification types, rows store the index
+            'hourly': {},  # epoch_hour: {guild_id: {type_id: count}}
+            'daily': {},  # epoch_day: {guild_id: {type_id: count}}
+            'recent': []  # [epoch, type_id, guild_id, channel_id, title]
         }
+        if data:
+            # Fold the old capped history into the rollups once
+            fresh['total_notifications'] = data.get('total_notifications', 0)
+            fresh['notifications_by_type'] = data.get('notifications_by_type', {})
+            for h in data.get('history', []):
+                try:
+                    epoch = int(datetime.fromisoformat(h['timestamp']).timestamp())
+                except (KeyError, ValueError):
+                    continue
+                self._record(fresh, epoch, h.get('type', 'unknown'), 0, h.get('channel_id'), h.get('title', ''))
+        return fresh
     
     def save_stats(self):
-        with open(config.STATS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(self.data, f, indent=2)
+        # A burst of notifications becomes a single background write
+        self.writer.schedule(lambda: self.data)
+    
+    def _record(self, data: dict, epoch: int, notif_type: str, guild_id: int, channel_id, title: str) -> list:
+        # Only a handful of types exist, so the interned list stays tiny
+        if notif_type not in data['types']:
+            data['types'].append(notif_type)
+        type_id = data['types'].index(notif_type)
+
+        hour, day = epoch // 3600, epoch // 86400
+        for buckets, key, retention in ((data['hourly'], hour, self.HOURLY_RETENTION),
+                                        (data['daily'], day, self.DAILY_RETENTION)):
+            if key not in buckets:
+                # New bucket: drop the ones that fell out of retention (once per hour/day)
+                for old in [k for k in buckets if k <= key - retention]:
+                    del buckets[old]
+            guild_bucket = buckets.setdefault(key, {}).setdefault(guild_id, {})
+            guild_bucket[type_id] = guild_bucket.get(type_id, 0) + 1
+        
+        row = [epoch, type_id, guild_id, channel_id, title]
+        data['recent'].append(row)
+        if len(data['recent']) > self.RECENT_SIZE:
+            del data['recent'][0]
+        return row
     
-    def add_notification(self, notif_type: str, title: str, channel_id: int):
+    def add_notification(self, notif_type: str, title: str, channel_id: int, guild_id: Optional[int] = None):
         self.data['total_notifications'] += 1
         self.data['notifications_by_type'][notif_type] = self.data['notifications_by_type'].get(notif_type, 0) + 1
-        self.data['history'].append({
-            'timestamp': datetime.now().isoformat(),
-            'type': notif_type,
-            'title': title,
-            'channel_id': channel_id
-        })
-        # Keep only last 100 notifications
-        if len(self.data['history']) > 100:
-            self.data['history'] = self.data['history'][-100:]
+        row = self._record(self.data, int(time_module.time()), notif_type, guild_id or 0, channel_id, title)
+        self.log.append(row)
         self.save_stats()
     
-    def get_summary(self, hours: int = 24) -> Dict:
-        cutoff = datetime.now().timestamp() - (hours * 3600)
-        recent = [h for h in self.data['history'] 
-                  if datetime.fromisoformat(h['timestamp']).timestamp() > cutoff]
+    def get_summary(self, hours: int = 24, guild_id: Optional[int] = None) -> Dict:
+        """Sum the rollup buckets of the period: O(buckets), independent of notification count"""
+        now = int(time_module.time())
+        if hours <= self.HOURLY_RETENTION:
+            buckets, end, count = self.data['hourly'], now // 3600, hours
+        else:
+            buckets, end, count = self.data['daily'], now // 86400, -(-hours // 24)
         
         summary = {
-            'total': len(recent),
+            'total': 0,
             'by_type': {}
         }
-        for notif in recent:
-            notif_type = notif['type']
-            summary['by_type'][notif_type] = summary['by_type'].get(notif_type, 0) + 1
+        types = self.data['types']
+        for key in range(end - count + 1, end + 1):
+            guilds = buckets.get(key)
+            if not guilds:
+                continue
+            for g, by_type in guilds.items():
+                if guild_id is not None and g != guild_id:
+                    continue
+                for type_id, n in by_type.items():
+                    summary['total'] += n
+                    summary['by_type'][types[type_id]] = summary['by_type'].get(types[type_id], 0) + n
         
         return summary
+    
+    def recent(self, limit: int = 5) -> List[dict]:
+        types = self.data['types']
+        return [{'timestamp': r[0], 'type': types[r[1]], 'guild_id': r[2], 'channel_id': r[3], 'title': r[4]}
+                for r in self.data['recent'][-limit:]]
 
 stats = Stats()
 
+# ==================== METRICS ====================
+class Metric:
+    """One metric family, optionally labelled, rendered in the Prometheus text format"""
+    kind = 'untyped'
+    
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.values = {}  # label values (tuple): value
+    
+    def _label_str(self, values: tuple, extra: tuple = ()) -> str:
+        pairs = list(zip(self.labels, values)) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+        return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+    
+    def samples(self):
+        for values, value in self.values.items():
+            yield '', self._label_str(values), value
+    
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{self.name}{suffix}{labels} {value}" for suffix, labels, value in self.samples()]
+        return lines
+
+class MetricCounter(Metric):
+    kind = 'counter'
+    
+    def __init__(self, name: str, help_text: str, labels: tuple = ()):
+        super().__init__(name, help_text, labels)
+        if not labels:
+            self.values[()] = 0  # Export 0 before the first event so rate() works
+    
+    def inc(self, *label_values, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+class MetricGauge(Metric):
+    kind = 'gauge'
+    
+    def __init__(self, name: str, help_text: str, labels: tuple = (), collect=None):
+        super().__init__(name, help_text, labels)
+        self.collect = collect  # Called at scrape time, returns {label values: value}
+    
+    def set(self, value: float, *label_values):
+        self.values[label_values] = value
+    
+    def samples(self):
+        if self.collect is not None:
+            try:
+                self.values = self.collect()
+            except Exception as e:
+                print(f"[Metrics] {self.name}: {e}")
+        yield from super().samples()
+
+class MetricHistogram(Metric):
+    kind = 'histogram'
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+    
+    def __init__(self, name: str, help_text: str, labels: tuple = (), buckets: tuple = BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+    
+    def observe(self, value: float, *label_values):
+        state = self.values.get(label_values)
+        if state is None:
+            state = self.values[label_values] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+        state['counts'][bisect.bisect_left(self.buckets, value)] += 1
+        state['sum'] += value
+        state['count'] += 1
+    
+    @contextmanager
+    def time(self, *label_values):
+        started = time_module.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time_module.perf_counter() - started, *label_values)
+    
+    def samples(self):
+        for values, state in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), state['counts']):
+                cumulative += count
+                yield '_bucket', self._label_str(values, (('le', bound),)), cumulative
+            yield '_sum', self._label_str(values), state['sum']
+            yield '_count', self._label_str(values), state['count']
+
+class Metrics:
+    """Everything the bot exports on /metrics"""
+    def __init__(self):
+        self.families = []
+        add = self.families.append
+        
+        # Latencies
+        self.cycle_duration = MetricHistogram('notifier_cycle_duration_seconds', 'Duration of one Kick/feed/Twitter run', ('subsystem',))
+        self.fetch_duration = MetricHistogram('notifier_fetch_duration_seconds', 'Fetch latency per source', ('type',))
+        self.parse_duration = MetricHistogram('notifier_parse_duration_seconds', 'Feed parse CPU/wall time', ('parser',))
+        self.send_duration = MetricHistogram('notifier_discord_send_duration_seconds', 'Discord message send latency')
+        for metric in (self.cycle_duration, self.fetch_duration, self.parse_duration, self.send_duration):
+            add(metric)
+        
+        # Events
+        self.notifications = MetricCounter('notifier_notifications_total', 'Notifications delivered', ('type',))
+        self.errors = MetricCounter('notifier_errors_total', 'Failed fetches and deliveries', ('type',))
+        self.timeouts = MetricCounter('notifier_timeouts_total', 'Fetch timeouts', ('type',))
+        self.filter_rejects = MetricCounter('notifier_filter_rejects_total', 'Items blocked by a filter', ('type',))
+        self.duplicates = MetricCounter('notifier_duplicates_suppressed_total', 'Items skipped as already notified', ('type',))
+        self.cycle_overruns = MetricCounter('notifier_cycle_overruns_total', 'Runs longer than CHECK_INTERVAL or cut off', ('subsystem',))
+        self.carried_over = MetricCounter('notifier_sources_carried_over_total', 'Sources moved to the next run', ('subsystem',))
+        for metric in (self.notifications, self.errors, self.timeouts, self.filter_rejects, self.duplicates,
+                       self.cycle_overruns, self.carried_over):
+            add(metric)
+        
+        # State, read at scrape time
+        self.last_cycle = MetricGauge('notifier_last_cycle_seconds', 'Duration of the last run', ('subsystem',))
+        self.check_interval = MetricGauge('notifier_check_interval_seconds', 'Configured CHECK_INTERVAL')
+        self.check_interval.set(config.CHECK_INTERVAL)
+        self.subscriptions = MetricGauge(
+            'notifier_subscriptions', 'Subscriptions per type', ('type',),
+            collect=lambda: {(t,): n for t, n in Counter(s['type'] for s in subscription_registry.all()).items()}
+        )
+        self.queue_depth = MetricGauge(
+            'notifier_dispatch_queue_depth', 'Notifications waiting for delivery',
+            collect=lambda: {(): notification_dispatcher.pending()}
+        )
+        self.voice_clients = MetricGauge(
+            'notifier_voice_clients', 'Connected voice clients',
+            collect=lambda: {(): sum(1 for vc in _voice_clients.values() if vc.is_connected())}
+        )
+        self.startup = MetricGauge(
+            'notifier_startup_phase_seconds', 'Time spent in each startup phase', ('phase',),
+            collect=lambda: {(phase,): seconds for phase, seconds in startup_profile.phases}
+        )
+        for metric in (self.last_cycle, self.check_interval, self.subscriptions, self.queue_depth, self.voice_clients,
+                       self.startup):
+            add(metric)
+    
+    def render(self) -> str:
+        lines = []
+        for metric in self.families:
+            lines += metric.render()
+        return '\n'.join(lines) + '\n'
+
+metrics = Metrics()
+
+class MetricsServer:
+    """Serves metrics.render() on http://METRICS_HOST:METRICS_PORT/metrics"""
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._runner = None
+    
+    async def start(self):
+        if self.port <= 0 or self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, self.host, self.port).start()
+        except OSError as e:
+            await runner.cleanup()
+            print(f"❌ Metrics: {self.host}:{self.port} açılamadı: {e}")
+            return
+        self._runner = runner
+        print(f"📈 Metrics: http://{self.host}:{self.port}/metrics")
+    
+    async def _handle(self, request):
+        return web.Response(
+            body=metrics.render().encode('utf-8'),
+            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+        )
+    
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+metrics_server = MetricsServer(config.METRICS_HOST, config.METRICS_PORT)
+
 # ==================== BOT SETUP ====================
 intents = discord.Intents.default()
 intents.message_content = False  # Gerekirse True yap
@@ -204,226 +777,1992 @@ intents.voice_states = True
 # intents.members = False  # Kullanmıyoruz
 # intents.presences = False  # Kullanmıyoruz
 
-bot = commands.Bot(command_prefix='!', intents=intents)
+class NotificationBot(commands.Bot):
+    async def close(self):
+        # Release long-lived resources before the connection goes away
+        await cycle_runner.close()
+        await notification_dispatcher.close()
+        await metrics_server.close()
+        await kick_driver_pool.close()
+        feed_parse_pool.close()
+        await http_sessions.close()
+        await state_writer.flush()
+        subscription_store.close()
+        await config.writer.close()
+        await stats.writer.close()
+        await stats.log.close()
+        await seen_entries.writer.close()
+        await twitter_client.writer.close()
+        await runtime_cache.writer.close()
+        await super().close()
+
+bot = NotificationBot(command_prefix='!', intents=intents)
 tree = bot.tree
 
 # Cache
-_subscriptions_cache = None
 _cache_lock = asyncio.Lock()
 _voice_clients = {}  # guild_id: voice_client
-_notified_entries = {}  # sub_id: set of entry_ids (prevent duplicates)
 
 # ==================== DATA MANAGEMENT ====================
-def load_subscriptions():
-    global _subscriptions_cache
-    if _subscriptions_cache is not None:
-        return _subscriptions_cache
+class SubscriptionStore:
+    """SQLite (WAL) storage for subscriptions with row-level, transactional writes"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS subscriptions (
+            uid INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            source_key TEXT NOT NULL,
+            guild_id INTEGER,
+            channel_id INTEGER,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_subs_source ON subscriptions(type, source_key);
+        CREATE INDEX IF NOT EXISTS idx_subs_guild ON subscriptions(guild_id);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = None
+        self._lock = threading.Lock()  # One connection, shared by worker threads
+        self._snapshots = {}  # uid: last written JSON, so unchanged rows are never rewritten
+    
+    def open(self):
+        if self.conn is not None:
+            return
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+    
+    @staticmethod
+    def _serialize(sub: dict) -> str:
+        return json.dumps({k: v for k, v in sub.items() if k != 'uid'}, ensure_ascii=False, sort_keys=True)
+    
+    @staticmethod
+    def _row(sub: dict, data: str) -> tuple:
+        return (sub.get('type', ''), source_key(sub), sub.get('guild_id'), sub.get('discord_channel_id'), data)
+    
+    def _insert(self, sub: dict):
+        data = self._serialize(sub)
+        cursor = self.conn.execute(
+            'INSERT INTO subscriptions (type, source_key, guild_id, channel_id, data) VALUES (?, ?, ?, ?, ?)',
+            self._row(sub, data)
+        )
+        sub['uid'] = cursor.lastrowid
+        self._snapshots[sub['uid']] = data
     
-    if not os.path.exists(config.SUBS_FILE):
-        _subscriptions_cache = []
-        return []
+    def _update(self, sub: dict) -> bool:
+        data = self._serialize(sub)
+        if self._snapshots.get(sub['uid']) == data:
+            return False
+        self.conn.execute(
+            'UPDATE subscriptions SET type = ?, source_key = ?, guild_id = ?, channel_id = ?, data = ? WHERE uid = ?',
+            self._row(sub, data) + (sub['uid'],)
+        )
+        self._snapshots[sub['uid']] = data
+        return True
     
-    try:
-        with open(config.SUBS_FILE, 'r', encoding='utf-8') as f:
-            _subscriptions_cache = json.load(f)
-            return _subscriptions_cache
-    except:
-        _subscriptions_cache = []
-        return []
-
-async def save_subscriptions(subscriptions):
-    global _subscriptions_cache
+    def import_json_once(self, json_path: str):
+        """Copy the legacy subscriptions.json into the database the first time it is opened"""
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+                return
+            subs = []
+            if os.path.exists(json_path):
+                try:
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        subs = json.load(f)
+                except:
+                    subs = []
+            with self.conn:
+                for sub in subs:
+                    sub.pop('uid', None)
+                    self._insert(sub)
+                self.conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', ?)", (str(int(time_module.time())),))
+            if subs:
+                print(f"🔄 {len(subs)} abonelik {json_path} → {self.path} aktarıldı")
+    
+    def load_all(self) -> List[dict]:
+        with self._lock:
+            subs = []
+            for uid, data in self.conn.execute('SELECT uid, data FROM subscriptions ORDER BY uid'):
+                sub = json.loads(data)
+                sub['uid'] = uid
+                self._snapshots[uid] = data
+                subs.append(sub)
+            return subs
+    
+    def insert(self, sub: dict):
+        with self._lock, self.conn:
+            self._insert(sub)
+    
+    def delete(self, sub: dict):
+        if 'uid' not in sub:
+            return
+        with self._lock, self.conn:
+            self.conn.execute('DELETE FROM subscriptions WHERE uid = ?', (sub['uid'],))
+            self._snapshots.pop(sub['uid'], None)
+    
+    def update_many(self, subs: List[dict]) -> tuple:
+        """Write a batch of changed rows in one transaction, returns (rows, bytes)"""
+        rows = 0
+        written = 0
+        with self._lock, self.conn:
+            for sub in subs:
+                if 'uid' in sub and self._update(sub):
+                    rows += 1
+                    written += len(self._snapshots[sub['uid']].encode('utf-8'))
+        return rows, written
+    
+    def close(self):
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+subscription_store = SubscriptionStore(config.SUBS_DB_FILE)
+
+class SubscriptionRegistry:
+    """In-memory subscriptions with indexes maintained on every add and remove"""
+    def __init__(self):
+        self.loaded = False
+        self.version = 0  # Bumped on every change so dependants can resync cheaply
+        self._all = {}  # uid: sub (insertion order = creation order)
+        self.by_id = {}  # id: {uid: sub}
+        self.by_source = {}  # source_key: {uid: sub}
+        self.by_guild = {}  # guild_id: {uid: sub}
+        self.by_channel = {}  # discord_channel_id: {uid: sub}
+    
+    def __len__(self):
+        return len(self._all)
+    
+    def _index(self, sub: dict):
+        uid = sub['uid']
+        self.by_id.setdefault(sub.get('id'), {})[uid] = sub
+        self.by_source.setdefault(source_key(sub), {})[uid] = sub
+        self.by_guild.setdefault(sub.get('guild_id'), {})[uid] = sub
+        self.by_channel.setdefault(sub.get('discord_channel_id'), {})[uid] = sub
+    
+    def _unindex(self, sub: dict):
+        uid = sub['uid']
+        for index, key in ((self.by_id, sub.get('id')), (self.by_source, source_key(sub)),
+                           (self.by_guild, sub.get('guild_id')), (self.by_channel, sub.get('discord_channel_id'))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(uid, None)
+                if not bucket:
+                    del index[key]
+    
+    def load(self, subs: List[dict]):
+        for sub in subs:
+            self._all[sub['uid']] = sub
+            self._index(sub)
+        self.loaded = True
+        self.version += 1
+    
+    def add(self, sub: dict):
+        self._all[sub['uid']] = sub
+        self._index(sub)
+        self.version += 1
+    
+    def remove(self, sub: dict):
+        if self._all.pop(sub['uid'], None) is not None:
+            self._unindex(sub)
+            self.version += 1
+    
+    def update(self, sub: dict, **fields):
+        """Change indexed fields (guild, channel, ...) and re-index the subscription"""
+        self._unindex(sub)
+        sub.update(fields)
+        self._index(sub)
+        self.version += 1
+    
+    def all(self) -> List[dict]:
+        return list(self._all.values())
+    
+    def source(self, key: str) -> List[dict]:
+        return list(self.by_source.get(key, {}).values())
+    
+    def source_types(self) -> Dict[str, str]:
+        return {key: next(iter(subs.values()))['type'] for key, subs in self.by_source.items()}
+    
+    def exists(self, sub: dict) -> bool:
+        """Is this source already followed in the same Discord channel?"""
+        return any(s.get('discord_channel_id') == sub.get('discord_channel_id')
+                   for s in self.by_source.get(source_key(sub), {}).values())
+    
+    def for_guild(self, guild_id: int, include_unassigned: bool = False) -> List[dict]:
+        subs = dict(self.by_guild.get(guild_id, {}))
+        if include_unassigned:
+            # Backward compatibility: old subscriptions without guild_id are shown everywhere
+            subs.update(self.by_guild.get(None, {}))
+        return [subs[uid] for uid in sorted(subs)]
+    
+    def find(self, name: str) -> Optional[dict]:
+        """Look a subscription up by its id or by a Kick / Twitter username"""
+        bucket = self.by_id.get(name)
+        if not bucket:
+            for source_type in ('kick', 'twitter'):
+                bucket = self.by_source.get(f"{source_type}:{name.strip().lower()}")
+                if bucket:
+                    break
+        return next(iter(bucket.values())) if bucket else None
+
+subscription_registry = SubscriptionRegistry()
+
+def get_registry() -> SubscriptionRegistry:
+    """The subscription registry, loaded from the database on first use"""
+    if not subscription_registry.loaded:
+        try:
+            subscription_store.open()
+            subscription_store.import_json_once(config.SUBS_FILE)
+            subscription_registry.load(subscription_store.load_all())
+        except sqlite3.Error as e:
+            print(f"❌ Abonelik veritabanı: {e}")
+            subscription_registry.load([])
+    return subscription_registry
+
+async def add_subscription(sub: dict):
+    """Insert one subscription (assigns its uid)"""
+    registry = get_registry()
+    async with _cache_lock:
+        await asyncio.to_thread(subscription_store.insert, sub)
+        registry.add(sub)
+
+async def remove_subscription(sub: dict):
+    """Delete one subscription row"""
+    registry = get_registry()
     async with _cache_lock:
-        _subscriptions_cache = subscriptions
-        await asyncio.to_thread(_write_subs_file, subscriptions)
+        await asyncio.to_thread(subscription_store.delete, sub)
+        registry.remove(sub)
+
+class StateWriter:
+    """Write-behind buffer for subscriber state: checkers mark changes, one flush per cycle"""
+    def __init__(self, store: SubscriptionStore):
+        self.store = store
+        self._dirty = {}  # uid: sub
+        self._flush_lock = asyncio.Lock()
+        self.flushes = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.last_flush = {'rows': 0, 'bytes': 0}
+    
+    def mark(self, sub: dict, **fields):
+        """Apply cursor / live flag changes in memory; they reach the database on the next flush"""
+        sub.update(fields)
+        if 'uid' in sub:
+            self._dirty[sub['uid']] = sub
+    
+    async def flush(self):
+        if not self._dirty:
+            return
+        async with self._flush_lock:
+            batch = list(self._dirty.values())
+            self._dirty.clear()
+            try:
+                # A single SQLite transaction: either every row lands or none does
+                rows, written = await asyncio.to_thread(self.store.update_many, batch)
+            except sqlite3.Error as e:
+                print(f"❌ Durum kaydı: {e}")
+                for sub in batch:
+                    self._dirty.setdefault(sub['uid'], sub)
+                return
+            self.flushes += 1
+            self.rows_written += rows
+            self.bytes_written += written
+            self.last_flush = {'rows': rows, 'bytes': written}
+
+state_writer = StateWriter(subscription_store)
+
+def source_key(sub: dict) -> str:
+    """Canonical key of the upstream source a subscription polls"""
+    if sub.get('type') in ('kick', 'twitter'):
+        return f"{sub['type']}:{sub.get('username', '').strip().lower()}"
+    return f"feed:{sub.get('url', '').strip()}"
+
+def group_by_source(subs: List[dict]) -> Dict[str, List[dict]]:
+    """Group subscriptions so every source is fetched once per cycle"""
+    groups = {}
+    for sub in subs:
+        groups.setdefault(source_key(sub), []).append(sub)
+    return groups
+
+# ==================== HTTP SESSION ====================
+class HttpSessionManager:
+    """One aiohttp session for the whole bot so DNS, TCP and TLS work is reused between cycles"""
+    def __init__(self):
+        self.session = None
+        self.stats = Counter()
+        self.in_flight = 0
+    
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+        
+        async def on_request_start(session, ctx, params):
+            self.stats['requests'] += 1
+            self.in_flight += 1
+        
+        async def on_request_end(session, ctx, params):
+            self.in_flight -= 1
+        
+        async def on_request_exception(session, ctx, params):
+            self.stats['errors'] += 1
+            self.in_flight -= 1
+        
+        async def on_connection_create_end(session, ctx, params):
+            self.stats['connections_created'] += 1
+        
+        async def on_connection_reuseconn(session, ctx, params):
+            self.stats['connections_reused'] += 1
+        
+        async def on_dns_cache_hit(session, ctx, params):
+            self.stats['dns_cache_hits'] += 1
+        
+        async def on_dns_cache_miss(session, ctx, params):
+            self.stats['dns_cache_misses'] += 1
+        
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+    
+    def get(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use inside the event loop"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=config.HTTP_POOL_LIMIT,
+                limit_per_host=config.HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=config.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT
+            )
+            timeout = aiohttp.ClientTimeout(total=config.REQUEST_TIMEOUT, connect=3)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                trace_configs=[self._trace_config()]
+            )
+        return self.session
+    
+    def pool_stats(self) -> dict:
+        created = self.stats['connections_created']
+        reused = self.stats['connections_reused']
+        dns_total = self.stats['dns_cache_hits'] + self.stats['dns_cache_misses']
+        return {
+            'requests': self.stats['requests'],
+            'errors': self.stats['errors'],
+            'in_flight': self.in_flight,
+            'connections_created': created,
+            'connections_reused': reused,
+            'reuse_ratio': reused / (created + reused) if created + reused else 0.0,
+            'dns_hit_ratio': self.stats['dns_cache_hits'] / dns_total if dns_total else 0.0,
+            'limit': config.HTTP_POOL_LIMIT,
+            'limit_per_host': config.HTTP_POOL_LIMIT_PER_HOST,
+        }
+    
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+http_sessions = HttpSessionManager()
+
+# ==================== RATE LIMITING ====================
+class HostRateLimiter:
+    """Shared per-host request spacing for all concurrent workers"""
+    def __init__(self, rates: Dict[str, float]):
+        self.intervals = {host: 1.0 / rate for host, rate in rates.items() if rate > 0}
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+    
+    async def wait(self, host: str):
+        interval = self.intervals.get(host)
+        if not interval:
+            return
+        
+        # Reserve the next free slot for this host, then sleep outside the lock
+        async with self._lock:
+            now = time_module.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+        
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+rate_limiter = HostRateLimiter({'kick.com': config.KICK_REQUESTS_PER_SECOND})
+kick_cycle_stats = {}  # Last Kick cycle: channels, elapsed, per-worker throughput
+
+# ==================== SOURCE SCHEDULER ====================
+class SourceScheduler:
+    """Priority queue of sources, each polled on its own adaptive interval"""
+    def __init__(self):
+        self._heap = []  # (due, seq, source_key)
+        self._state = {}  # source_key: {type, interval, due}
+        self._seq = itertools.count()
+        self.synced_version = None  # Registry version the sources were last synced from
+    
+    def _limits(self, source_type: str):
+        return config.POLL_LIMITS.get(source_type, (config.CHECK_INTERVAL, config.CHECK_INTERVAL))
+    
+    def _push(self, key: str, due: float):
+        self._state[key]['due'] = due
+        heapq.heappush(self._heap, (due, next(self._seq), key))
+    
+    def sync(self, source_types: Dict[str, str]):
+        """Schedule new sources and forget removed ones"""
+        now = time_module.monotonic()
+        for key, source_type in source_types.items():
+            if key in self._state:
+                continue
+            floor, ceiling = self._limits(source_type)
+            interval = min(max(config.CHECK_INTERVAL, floor), ceiling)
+            self._state[key] = {'type': source_type, 'interval': interval, 'due': None}
+            # Spread first polls over one interval instead of bursting at startup
+            self._push(key, now + random.uniform(0, interval))
+        
+        for key in [k for k in self._state if k not in source_types]:
+            del self._state[key]  # Heap entries are dropped lazily in pop_due
+    
+    def pop_due(self) -> List[str]:
+        """Sources whose time has come; they stay in flight until record() is called"""
+        now = time_module.monotonic()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, _, key = heapq.heappop(self._heap)
+            state = self._state.get(key)
+            if state is None or state['due'] != due_at:
+                continue  # Removed or rescheduled
+            state['due'] = None
+            due.append(key)
+        return due
+    
+    def record(self, key: str, outcome: str, retry_at: Optional[float] = None):
+        """Reschedule a polled source: activity -> floor, idle/error -> exponential backoff"""
+        state = self._state.get(key)
+        if state is None:
+            return
+        floor, ceiling = self._limits(state['type'])
+        
+        if outcome == 'activity':
+            interval = floor
+        elif outcome == 'error':
+            interval = state['interval'] * config.POLL_ERROR_BACKOFF
+        else:
+            interval = state['interval'] * config.POLL_IDLE_BACKOFF
+        interval = min(max(interval, floor), ceiling)
+        state['interval'] = interval
+        
+        delay = interval * random.uniform(1 - config.POLL_JITTER, 1 + config.POLL_JITTER)
+        if retry_at is not None:
+            delay = max(delay, retry_at - time_module.monotonic())
+        self._push(key, time_module.monotonic() + delay)
+    
+    def unreported(self, keys: List[str]) -> List[str]:
+        """Dispatched sources that have not been recorded yet"""
+        return [key for key in keys if key in self._state and self._state[key]['due'] is None]
+    
+    def finish(self, keys: List[str]):
+        """Sources that were dispatched but never reported back count as errors"""
+        for key in keys:
+            state = self._state.get(key)
+            if state is not None and state['due'] is None:
+                self.record(key, 'error')
+    
+    def next_due_in(self) -> Optional[float]:
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - time_module.monotonic())
+
+source_scheduler = SourceScheduler()
+
+# ==================== FEED VALIDATOR CACHE ====================
+class FeedValidatorCache:
+    """ETag, Last-Modified and body hash per feed URL so unchanged feeds are never re-parsed"""
+    MAX_AGE = 7 * 24 * 3600  # Forget feeds nobody has polled for a week
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._entries = None  # Read on first use, not at import
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+    
+    @property
+    def entries(self) -> dict:
+        if self._entries is None:
+            self._entries = self.load()
+        return self._entries
+    
+    @entries.setter
+    def entries(self, value: dict):
+        self._entries = value
+    
+    def load(self) -> dict:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                pass
+        return {}
+    
+    def request_headers(self, url: str) -> dict:
+        entry = self.entries.get(url, {})
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def is_unchanged(self, url: str, body_hash: str) -> bool:
+        return self.entries.get(url, {}).get('hash') == body_hash
+    
+    def update(self, url: str, headers, body_hash: Optional[str] = None):
+        entry = self.entries.setdefault(url, {})
+        if headers.get('ETag'):
+            entry['etag'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            entry['last_modified'] = headers['Last-Modified']
+        if body_hash:
+            entry['hash'] = body_hash
+        entry['checked_at'] = int(time_module.time())
+        self._dirty = True
+    
+    def touch(self, url: str):
+        if url in self.entries:
+            self.entries[url]['checked_at'] = int(time_module.time())
+            self._dirty = True
+    
+    def _write(self, entries: dict):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+    
+    async def save(self):
+        if not self._dirty:
+            return
+        cutoff = time_module.time() - self.MAX_AGE
+        self.entries = {url: e for url, e in self.entries.items() if e.get('checked_at', 0) >= cutoff}
+        self._dirty = False
+        await asyncio.to_thread(self._write, dict(self.entries))
 
-def _write_subs_file(subscriptions):
-    with open(config.SUBS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(subscriptions, f, indent=2)
+feed_cache = FeedValidatorCache(config.FEED_CACHE_FILE)
+
+# ==================== SEEN ENTRIES ====================
+class SeenEntries:
+    """Per-source LRU of handled feed entry ids, kept across restarts"""
+    def __init__(self, path: str, capacity: int):
+        self.path = path
+        self.capacity = capacity
+        self._sources = None  # source_key: OrderedDict of entry_id, least recently seen first (read on first use)
+        self.writer = DebouncedJsonWriter(path, config.SAVE_DEBOUNCE_SECONDS, ensure_ascii=False)
+        self._dirty = False
+    
+    @property
+    def sources(self) -> Dict[str, OrderedDict]:
+        if self._sources is None:
+            self._sources = self.load()
+        return self._sources
+    
+    def load(self) -> Dict[str, OrderedDict]:
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return {key: OrderedDict.fromkeys(ids) for key, ids in json.load(f).items()}
+            except:
+                pass
+        return {}
+    
+    def get(self, key: str) -> Optional[OrderedDict]:
+        return self.sources.get(key)
+    
+    def add(self, key: str, entry_ids: List[str]):
+        """Remember the ids of a feed document (newest first), evicting the least recently seen"""
+        seen = self.sources.setdefault(key, OrderedDict())
+        for entry_id in reversed(entry_ids):
+            seen[entry_id] = None
+            seen.move_to_end(entry_id)
+        while len(seen) > self.capacity:
+            seen.popitem(last=False)
+        self._dirty = True
+    
+    def save(self, active_keys):
+        if not self._dirty:
+            return
+        for key in [k for k in self.sources if k not in active_keys]:
+            del self.sources[key]
+        self._dirty = False
+        self.writer.schedule(lambda: {key: list(seen) for key, seen in self.sources.items()})
+
+seen_entries = SeenEntries(config.SEEN_ENTRIES_FILE, config.SEEN_ENTRIES_PER_SOURCE)
+
+# ==================== FEED PARSING ====================
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+CONTENT_NS = '{http://purl.org/rss/1.0/modules/content/}'
+FEED_CHUNK_SIZE = 16384
+# After an early stop, a remainder up to this size is read (not parsed) so the keep-alive
+# connection can be reused; anything larger costs more than a new connection and is dropped
+FEED_DRAIN_LIMIT = 262144
+
+feed_parse_stats = Counter()  # fast / fallback documents, bytes_read / _drained / _skipped, early_stops, *_cpu seconds
+_feed_sizes = {}  # url: size of the last fully read document, to estimate what early stops saved
+
+class UnsupportedFeed(Exception):
+    """Document shape the streaming parser does not handle (feedparser takes over)"""
+
+def parse_feed_date(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    text = text.strip()
+    try:
+        parsed = parsedate_to_datetime(text)  # RSS (RFC 822)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(text)  # Atom (RFC 3339)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        return calendar.timegm(parsed.timetuple())
+    return int(parsed.timestamp())
+
+class FeedParsePool:
+    """Optional worker processes for large documents, so feedparser does not compete with the gateway for the GIL"""
+    def __init__(self, workers: int, threshold: int):
+        self.workers = workers
+        self.threshold = threshold
+        self._executor = None
+    
+    def _submit(self, content: bytes):
+        # A spawned worker first re-runs the parent's __main__ (bot.py, with the bot, config and
+        # every singleton). Workers start inside submit(), so point __main__ at feed_fallback meanwhile
+        main = sys.modules['__main__']
+        spec = main.__spec__
+        main.__spec__ = importlib.util.find_spec('feed_fallback')
+        try:
+            return self._executor.submit(parse_feed_document, content)
+        finally:
+            main.__spec__ = spec
+    
+    async def parse(self, content: bytes):
+        if self.workers <= 0 or len(content) < self.threshold:
+            return await asyncio.to_thread(parse_feed_document, content)
+        
+        if self._executor is None:
+            # spawn: forking a process that runs the gateway and SQLite threads is not safe
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            result = await asyncio.wrap_future(self._submit(content))
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM): start a fresh pool next time, parse this one in a thread
+            self._executor = None
+            return await asyncio.to_thread(parse_feed_document, content)
+        feed_parse_stats['pool'] += 1
+        return result
+    
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+feed_parse_pool = FeedParsePool(config.FEED_PARSE_WORKERS, config.FEED_PARSE_POOL_THRESHOLD)
+
+class FeedStreamParser:
+    """Incremental parser for YouTube/Atom and RSS 2.0 documents, fed chunk by chunk"""
+    def __init__(self):
+        self._parser = ET.XMLPullParser(events=('start', 'end'))
+        self._kind = None  # 'atom' or 'rss'
+        self._entry = None  # Summary of the entry being read
+        self._summary = None
+        self.title = None
+    
+    def feed(self, data: bytes) -> list:
+        """Consume a chunk and return the entries it completed"""
+        self._parser.feed(data)
+        return self._drain()
+    
+    def close(self) -> list:
+        self._parser.close()
+        return self._drain()
+    
+    def _drain(self) -> list:
+        done = []
+        for event, elem in self._parser.read_events():
+            if self._kind is None:
+                if elem.tag == 'rss':
+                    self._kind = 'rss'
+                elif elem.tag == ATOM_NS + 'feed':
+                    self._kind = 'atom'
+                else:
+                    raise UnsupportedFeed(elem.tag)
+                continue
+            
+            if event == 'start':
+                if elem.tag in ('item', ATOM_NS + 'entry'):
+                    self._entry = {'id': None, 'title': '', 'link': None, 'author': None, 'published': None, 'thumbnail': None}
+                    self._summary = None
+                continue
+            
+            if self._entry is None:
+                if elem.tag in ('title', ATOM_NS + 'title') and self.title is None:
+                    self.title = (elem.text or '').strip()
+                continue
+            
+            if elem.tag in ('item', ATOM_NS + 'entry'):
+                entry, self._entry = self._entry, None
+                if not entry['link'] and self._kind == 'rss' and entry['id'] and entry['id'].startswith('http'):
+                    entry['link'] = entry['id']
+                entry['id'] = entry['id'] or entry['link']
+                if not entry['thumbnail'] and self._summary:
+                    match = IMG_SRC_RE.search(self._summary)
+                    if match:
+                        entry['thumbnail'] = match.group(1)
+                elem.clear()
+                done.append(entry)
+            else:
+                self._read_field(elem)
+        return done
+    
+    def _read_field(self, elem):
+        entry, tag = self._entry, elem.tag
+        text = (elem.text or '').strip()
+        if tag in ('guid', ATOM_NS + 'id'):
+            entry['id'] = text or None
+        elif tag in ('title', ATOM_NS + 'title'):
+            entry['title'] = text
+        elif tag == 'link':
+            entry['link'] = text or entry['link']
+        elif tag == ATOM_NS + 'link':
+            if not entry['link'] and elem.get('rel', 'alternate') == 'alternate':
+                entry['link'] = elem.get('href')
+        elif tag in ('author', DC_NS + 'creator', ATOM_NS + 'name'):
+            entry['author'] = entry['author'] or text or None
+        elif tag in ('pubDate', ATOM_NS + 'published'):
+            entry['published'] = parse_feed_date(text)
+        elif tag == MEDIA_NS + 'thumbnail':
+            entry['thumbnail'] = entry['thumbnail'] or elem.get('url')
+        elif tag in ('description', CONTENT_NS + 'encoded', ATOM_NS + 'summary', ATOM_NS + 'content'):
+            self._summary = self._summary or elem.text
+
+async def drain_response(resp, limit: int):
+    """Read and discard the rest of a body, at most `limit` bytes; returns (bytes read, reached the end)"""
+    drained = 0
+    while drained < limit:
+        chunk = await resp.content.read(min(FEED_CHUNK_SIZE, limit - drained))
+        if not chunk:
+            return drained, True
+        drained += len(chunk)
+    return drained, resp.content.at_eof()
+
+async def read_feed(resp, url: str, known, limit: Optional[int]) -> dict:
+    """Parse entries while the body downloads and stop at the first known id (or after `limit` new ones).
+    
+    Returns title, entries (up to and including the known one) and whether it stopped early.
+    Documents the fast path does not understand come back as `content` for feedparser."""
+    parser = FeedStreamParser()
+    consumed = []
+    entries = []
+    new_count = 0
+    stopped = False
+    cpu = 0.0
+    try:
+        async for chunk in resp.content.iter_chunked(FEED_CHUNK_SIZE):
+            consumed.append(chunk)
+            started = time_module.thread_time()
+            completed = parser.feed(chunk)
+            cpu += time_module.thread_time() - started
+            for entry in completed:
+                entries.append(entry)
+                if entry['id'] in known:
+                    stopped = True
+                    break
+                new_count += 1
+                if limit and new_count >= limit:
+                    stopped = True
+                    break
+            if stopped:
+                break
+        if not stopped:
+            entries.extend(parser.close())
+    except (UnsupportedFeed, ET.ParseError):
+        # Unusual shape or not well-formed: read the rest and let feedparser cope
+        consumed.append(await resp.content.read())
+        return {'content': b''.join(consumed)}
+    
+    read = sum(len(chunk) for chunk in consumed)
+    feed_parse_stats['fast'] += 1
+    feed_parse_stats['fast_cpu'] += cpu
+    metrics.parse_duration.observe(cpu, 'stream')
+    feed_parse_stats['bytes_read'] += read
+    if stopped:
+        feed_parse_stats['early_stops'] += 1
+        # Content-Length counts compressed bytes when the body is encoded; `read` is always decoded
+        length = None if resp.headers.get('Content-Encoding', 'identity') != 'identity' else resp.content_length
+        total = length or _feed_sizes.get(url) or 0
+        drained, finished = 0, False
+        if not length or length - read <= FEED_DRAIN_LIMIT:
+            drained, finished = await drain_response(resp, FEED_DRAIN_LIMIT)
+            feed_parse_stats['bytes_drained'] += drained
+        if not finished:
+            # Closing drops the connection; only what never arrived counts as skipped
+            resp.close()
+            feed_parse_stats['bytes_skipped'] += max(0, total - read - drained)
+    else:
+        _feed_sizes[url] = read
+    return {'content': None, 'title': parser.title, 'entries': entries, 'stopped': stopped}
 
 # ==================== SELENIUM ====================
-def get_kick_channel_data_with_driver(driver, username):
+def _process_tree_rss_mb(pid: int) -> float:
+    """Resident memory of a process and all of its children (Linux /proc only)"""
+    total_kb = 0
+    stack = [pid]
+    seen = set()
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f'/proc/{current}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+            for task in os.listdir(f'/proc/{current}/task'):
+                with open(f'/proc/{current}/task/{task}/children', 'r') as f:
+                    stack.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+class GeckoDriverResolver:
+    """geckodriver path, cached in the runtime cache; only looked up online when the cached binary is gone"""
+    def __init__(self):
+        self._task = None
+    
+    @staticmethod
+    def _install() -> str:
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    
+    async def _resolve(self) -> Optional[str]:
+        cached = runtime_cache.get('geckodriver')
+        if cached and os.path.exists(cached):
+            return cached
+        try:
+            path = await asyncio.to_thread(self._install)
+        except Exception as e:
+            print(f"❌ GeckoDriver: {e}")
+            return None
+        # Saved from the event loop, so it goes through the debounced writer like every other save
+        runtime_cache.set('geckodriver', path)
+        print("✅ GeckoDriver hazır")
+        return path
+    
+    def prefetch(self):
+        """Start resolving in the background (never delays readiness)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._resolve())
+    
+    async def path(self) -> Optional[str]:
+        """Resolved path, or None to let Selenium find the driver itself"""
+        self.prefetch()
+        path = await asyncio.shield(self._task)
+        if path is None:
+            self._task = None  # Try again with the next browser
+        return path
+
+geckodriver = GeckoDriverResolver()
+
+class KickDriverSession:
+    """A warm headless Firefox kept alive between check cycles"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.requests = 0
+        self.broken = False
+        self.created_at = time_module.time()
+        self.pid = driver.capabilities.get('moz:processID')
+    
+    def memory_mb(self) -> float:
+        if not self.pid:
+            return 0.0
+        return _process_tree_rss_mb(self.pid)
+    
+    def is_healthy(self) -> bool:
+        if self.broken:
+            return False
+        try:
+            self.driver.execute_script('return 1')
+            return True
+        except selenium_api().WebDriverException:
+            return False
+    
+    def needs_recycle(self) -> bool:
+        if self.requests >= config.KICK_DRIVER_MAX_REQUESTS:
+            return True
+        if config.KICK_DRIVER_MAX_MEMORY_MB and self.memory_mb() > config.KICK_DRIVER_MAX_MEMORY_MB:
+            return True
+        return False
+    
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+class KickDriverPool:
+    """Pool of long-lived Firefox sessions borrowed by the Kick checker"""
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._idle = deque()
+        self._created = 0
+        self._sessions = set()  # every live session, idle or borrowed
+        self._closed = False
+        self._slots = asyncio.Condition()  # Woken when a session is returned or a slot frees up
+        self.recycled = 0
+        self.crashed = 0
+    
+    def _build_options(self):
+        options = selenium_api().FirefoxOptions()
+        options.add_argument("--headless")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")  # Reduce memory usage
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-images")  # Don't load images
+        options.page_load_strategy = 'eager'
+        
+        # Set memory and cache limits
+        options.set_preference("browser.cache.disk.enable", False)
+        options.set_preference("browser.cache.memory.enable", False)
+        
+        if os.path.exists(config.FIREFOX_BINARY_PATH):
+            options.binary_location = config.FIREFOX_BINARY_PATH
+        return options
+    
+    async def _spawn(self) -> KickDriverSession:
+        sel = selenium_api()
+        options = self._build_options()
+        driver_path = await geckodriver.path()
+        service = sel.FirefoxService(executable_path=driver_path) if driver_path else sel.FirefoxService()
+        driver = await asyncio.to_thread(
+            lambda: sel.webdriver.Firefox(service=service, options=options)
+        )
+        session = KickDriverSession(driver)
+        if self._closed:
+            # Pool shut down while Firefox was starting
+            await asyncio.to_thread(session.quit)
+            raise RuntimeError("Kick driver pool is closed")
+        self._sessions.add(session)
+        return session
+    
+    async def _free_slot(self):
+        async with self._slots:
+            self._created -= 1
+            self._slots.notify()
+    
+    async def _discard(self, session: KickDriverSession):
+        if session not in self._sessions:
+            return
+        self._sessions.discard(session)
+        # Free the slot first so a waiting borrower can spawn the replacement
+        await self._free_slot()
+        await asyncio.to_thread(session.quit)
+    
+    async def acquire(self) -> KickDriverSession:
+        while True:
+            async with self._slots:
+                await self._slots.wait_for(
+                    lambda: self._closed or self._idle or self._created < self.size
+                )
+                if self._closed:
+                    raise RuntimeError("Kick driver pool is closed")
+                if self._idle:
+                    session = self._idle.popleft()
+                else:
+                    self._created += 1
+                    session = None
+            
+            if session is None:
+                try:
+                    return await self._spawn()
+                except BaseException:
+                    await self._free_slot()
+                    raise
+            
+            # Recycle old or bloated sessions, replace crashed ones
+            if await asyncio.to_thread(session.needs_recycle):
+                self.recycled += 1
+                await self._discard(session)
+                continue
+            if not await asyncio.to_thread(session.is_healthy):
+                self.crashed += 1
+                print(f"🟡 Kick driver yanıt vermiyor, yeniden başlatılıyor (pid {session.pid})")
+                await self._discard(session)
+                continue
+            return session
+    
+    async def release(self, session: KickDriverSession):
+        if self._closed:
+            await self._discard(session)
+            return
+        if session.broken:
+            self.crashed += 1
+            await self._discard(session)
+            return
+        async with self._slots:
+            self._idle.append(session)
+            self._slots.notify()
+    
+    @asynccontextmanager
+    async def borrow(self):
+        session = await self.acquire()
+        try:
+            yield session
+        finally:
+            await self.release(session)
+    
+    async def close(self):
+        """Quit every live session, including borrowed ones (called on bot shutdown)"""
+        async with self._slots:
+            self._closed = True
+            self._idle.clear()
+            self._slots.notify_all()
+        for session in list(self._sessions):
+            await self._discard(session)
+
+kick_driver_pool = KickDriverPool(config.KICK_DRIVER_POOL_SIZE)
+
+def get_kick_channel_data_with_driver(session: KickDriverSession, username):
+    sel = selenium_api()
     try:
-        api_url = f"https://kick.com/api/v2/channels/{username}"
-        driver.set_page_load_timeout(config.SELENIUM_TIMEOUT)
-        driver.get(api_url)
+        api_url = KICK_API_URL.format(username=username)
+        session.requests += 1
+        session.driver.set_page_load_timeout(config.SELENIUM_TIMEOUT)
+        session.driver.get(api_url)
         
-        wait = WebDriverWait(driver, config.SELENIUM_TIMEOUT)
-        body_element = wait.until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+        wait = sel.WebDriverWait(session.driver, config.SELENIUM_TIMEOUT)
+        body_element = wait.until(sel.EC.presence_of_element_located((sel.By.TAG_NAME, 'body')))
         json_text = body_element.text
         
         return json.loads(json_text)
+    except sel.TimeoutException as e:
+        metrics.timeouts.inc('kick')
+        print(f"[Kick API] {username}: {e}")
+        return None
+    except sel.WebDriverException as e:
+        # Browser crashed or session lost - the pool replaces it
+        session.broken = True
+        print(f"[Kick API] {username}: {e}")
+        return None
     except Exception as e:
         print(f"[Kick API] {username}: {e}")
         return None
 
+# ==================== KICK API ====================
+KICK_API_URL = "https://kick.com/api/v2/channels/{username}"
+KICK_HOME_URL = "https://kick.com/"
+
+class KickHttpClient:
+    """Plain HTTP access to the Kick channel API, sharing cookies with the browser fallback"""
+    def __init__(self):
+        self.user_agent = 'Mozilla/5.0 (X11; Linux x86_64; rv:115.0) Gecko/20100101 Firefox/115.0'
+        self.blocked_until = 0.0
+        self._warmed_up = False
+    
+    def is_blocked(self) -> bool:
+        return time_module.time() < self.blocked_until
+    
+    def _headers(self) -> dict:
+        return {
+            'User-Agent': self.user_agent,
+            'Accept': 'application/json',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': KICK_HOME_URL,
+        }
+    
+    async def _get_json(self, session: aiohttp.ClientSession, url: str):
+        async with session.get(url, headers=self._headers()) as resp:
+            content_type = resp.headers.get('Content-Type', '')
+            if resp.status == 404:
+                return 'not_found', None
+            if resp.status in (403, 429, 503) or resp.headers.get('cf-mitigated'):
+                return 'blocked', None
+            if resp.status != 200:
+                return 'error', None
+            if 'json' not in content_type:
+                # Challenge pages come back as HTML with a 200
+                return 'blocked', None
+            return 'ok', await resp.json(content_type=None)
+    
+    async def _warm_up(self, session: aiohttp.ClientSession):
+        """Load the home page once so Cloudflare/session cookies land in the jar"""
+        headers = self._headers()
+        headers['Accept'] = 'text/html,application/xhtml+xml'
+        async with session.get(KICK_HOME_URL, headers=headers) as resp:
+            await resp.read()
+        self._warmed_up = True
+    
+    async def fetch(self, session: aiohttp.ClientSession, username: str):
+        """Returns (status, data) where status is ok, not_found, blocked or error"""
+        url = KICK_API_URL.format(username=username)
+        try:
+            status, data = await self._get_json(session, url)
+            if status == 'blocked' and not self._warmed_up:
+                await self._warm_up(session)
+                status, data = await self._get_json(session, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError, json.JSONDecodeError) as e:
+            if isinstance(e, asyncio.TimeoutError):
+                metrics.timeouts.inc('kick')
+            print(f"[Kick HTTP] {username}: {e}")
+            return 'error', None
+        
+        if status == 'blocked':
+            # Warm up again once the cooldown is over, cookies may have expired
+            self.blocked_until = time_module.time() + config.KICK_HTTP_BLOCK_COOLDOWN
+            self._warmed_up = False
+        return status, data
+    
+    @staticmethod
+    def read_browser_state(driver_session: KickDriverSession):
+        """Cookies and user agent of a browser that got through the challenge (blocking)"""
+        try:
+            cookies = driver_session.driver.get_cookies()
+            user_agent = driver_session.driver.execute_script('return navigator.userAgent')
+            return cookies, user_agent
+        except selenium_api().WebDriverException:
+            return None, None
+    
+    def apply_browser_state(self, session: aiohttp.ClientSession, cookies, user_agent):
+        """Reuse the browser's challenge cookies for the following HTTP requests"""
+        if not cookies:
+            return
+        session.cookie_jar.update_cookies(
+            {c['name']: c['value'] for c in cookies if 'name' in c and 'value' in c},
+            response_url=URL(KICK_HOME_URL)
+        )
+        if user_agent:
+            self.user_agent = user_agent
+        self.blocked_until = 0.0
+        self._warmed_up = True
+
+kick_http = KickHttpClient()
+kick_fetch_paths = Counter()  # Which path served each Kick request this cycle: http, selenium, failed
+
+async def get_kick_channel_data(username, session: Optional[aiohttp.ClientSession] = None):
+    """Fetch Kick channel JSON over plain HTTP, falling back to a pooled browser when blocked"""
+    fell_back = False
+    if session is not None and config.KICK_FETCH_MODE != 'selenium' and not kick_http.is_blocked():
+        status, data = await kick_http.fetch(session, username)
+        if status in ('ok', 'not_found'):
+            kick_fetch_paths['http'] += 1
+            return data
+        if status == 'error' or config.KICK_FETCH_MODE == 'http':
+            kick_fetch_paths['failed'] += 1
+            return None
+        fell_back = True
+    
+    if config.KICK_FETCH_MODE == 'http':
+        # Never start Firefox in this mode, not even during the block cooldown
+        kick_fetch_paths['failed'] += 1
+        return None
+    
+    data = None
+    try:
+        async with kick_driver_pool.borrow() as driver_session:
+            try:
+                data = await asyncio.to_thread(get_kick_channel_data_with_driver, driver_session, username)
+            except asyncio.CancelledError:
+                # The page load goes on in its thread: never hand this browser out again
+                driver_session.broken = True
+                raise
+            if data is not None and fell_back:
+                cookies, user_agent = await asyncio.to_thread(kick_http.read_browser_state, driver_session)
+                kick_http.apply_browser_state(session, cookies, user_agent)
+    finally:
+        kick_fetch_paths['selenium' if data is not None else 'failed'] += 1
+    
+    if config.TEST_MODE and fell_back:
+        print(f"🟡 Kick HTTP engellendi, Selenium kullanıldı: {username}")
+    return data
+
 # ==================== TWITTER CLIENT ====================
 class TwitterClient:
+    USERS_PER_LOOKUP = 100  # get_users limit per request
+    MISS_TTL = 3600  # Unknown handles are looked up again after an hour
+    
     def __init__(self):
-        self.client = None
+        self.client = None  # Created by connect() when the first account is checked
+        self._connected = False
+        self._users = None  # handle (lowercase): {id, username, name, profile_image_url, resolved_at}
+        self.writer = DebouncedJsonWriter(config.TWITTER_ID_CACHE_FILE, config.SAVE_DEBOUNCE_SECONDS, ensure_ascii=False)
+        self._limits = {}  # endpoint: {remaining, reset (epoch)} from the x-rate-limit-* headers
+        self._semaphore = asyncio.Semaphore(config.TWITTER_CONCURRENCY)
         if not TWITTER_AVAILABLE:
             print("⚠️ Twitter features unavailable - install tweepy")
-            return
-        
-        if config.TWITTER_BEARER_TOKEN:
+    
+    @property
+    def users(self) -> dict:
+        if self._users is None:
+            self._users = self.load_users()
+        return self._users
+    
+    def connect(self) -> bool:
+        """Import tweepy and create the API client on first use"""
+        if tweepy_api() is None:
+            return False
+        if self.client is None and not self._connected and config.TWITTER_BEARER_TOKEN:
+            self._connected = True
             try:
-                self.client = tweepy.Client(bearer_token=config.TWITTER_BEARER_TOKEN)
+                # Raw responses so the rate limit headers can be read
+                self.client = tweepy.Client(bearer_token=config.TWITTER_BEARER_TOKEN, return_type=requests.Response)
             except Exception as e:
                 print(f"[Twitter] Init failed: {e}")
+        return self.client is not None
     
-    async def get_user_tweets(self, username: str, last_tweet_id: Optional[str] = None):
-        if not self.client or not TWITTER_AVAILABLE:
+    def load_users(self) -> dict:
+        if os.path.exists(config.TWITTER_ID_CACHE_FILE):
+            try:
+                with open(config.TWITTER_ID_CACHE_FILE, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except:
+                pass
+        return {}
+    
+    def _note_limits(self, endpoint: str, response):
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            self._limits[endpoint] = {
+                'remaining': int(headers['x-rate-limit-remaining']),
+                'reset': int(headers['x-rate-limit-reset'])
+            }
+        except (KeyError, ValueError):
+            pass
+    
+    def retry_at(self, endpoint: str) -> Optional[float]:
+        """Monotonic time the endpoint can be used again, None if it has requests left"""
+        limit = self._limits.get(endpoint)
+        if not limit or limit['remaining'] > 0:
+            return None
+        wait = limit['reset'] - time_module.time()
+        if wait <= 0:
             return None
+        return time_module.monotonic() + wait
+    
+    def _fresh(self, entry: Optional[dict]) -> bool:
+        if not entry:
+            return False
+        ttl = config.TWITTER_ID_TTL if entry.get('id') else self.MISS_TTL
+        return time_module.time() - entry.get('resolved_at', 0) < ttl
+    
+    async def resolve_users(self, usernames: List[str]) -> Dict[str, Optional["tweepy.User"]]:
+        """Handle -> user, from the cache or one get_users call per 100 unknown handles"""
+        if not self.connect():
+            return {}
         
-        try:
-            user = await asyncio.to_thread(
-                self.client.get_user, 
-                username=username,
-                user_fields=['profile_image_url']
-            )
+        stale = list(dict.fromkeys(u.lower() for u in usernames if not self._fresh(self.users.get(u.lower()))))
+        for i in range(0, len(stale), self.USERS_PER_LOOKUP):
+            if self.retry_at('users'):
+                break
+            batch = stale[i:i + self.USERS_PER_LOOKUP]
+            try:
+                response = await asyncio.to_thread(
+                    self.client.get_users,
+                    usernames=batch,
+                    user_fields=['profile_image_url']
+                )
+            except tweepy.TweepyException as e:
+                self._note_limits('users', getattr(e, 'response', None))
+                print(f"[Twitter] get_users: {e}")
+                break
+            self._note_limits('users', response)
             
-            if not user.data:
+            now = int(time_module.time())
+            for handle in batch:
+                self.users[handle] = {'id': None, 'resolved_at': now}
+            for user in response.json().get('data', []):
+                self.users[user['username'].lower()] = {
+                    'id': user['id'],
+                    'username': user['username'],
+                    'name': user.get('name', user['username']),
+                    'profile_image_url': user.get('profile_image_url'),
+                    'resolved_at': now
+                }
+            self.writer.schedule(lambda: self.users)
+        
+        resolved = {}
+        for username in usernames:
+            entry = self.users.get(username.lower())
+            resolved[username] = tweepy.User(entry) if entry and entry.get('id') else None
+        return resolved
+    
+    async def get_timeline(self, user: "tweepy.User", since_id: Optional[int] = None) -> Optional[list]:
+        """Latest tweets of a resolved user (newest first), None on failure"""
+        async with self._semaphore:
+            if self.retry_at('timeline'):
                 return None
-            
-            tweets = await asyncio.to_thread(
-                self.client.get_users_tweets,
-                id=user.data.id,
-                max_results=5,
-                tweet_fields=['created_at', 'text'],
-                since_id=last_tweet_id
-            )
-            
-            return {
-                'user': user.data,
-                'tweets': tweets.data if tweets.data else []
-            }
-        except Exception as e:
-            print(f"[Twitter] {username}: {e}")
-            return None
+            try:
+                with metrics.fetch_duration.time('twitter'):
+                    response = await asyncio.to_thread(
+                        self.client.get_users_tweets,
+                        id=user.id,
+                        max_results=5,
+                        tweet_fields=['created_at', 'text'],
+                        since_id=since_id
+                    )
+            except tweepy.NotFound:
+                # Account gone or renamed: resolve the handle again next time
+                self.users.pop(user.username.lower(), None)
+                metrics.errors.inc('twitter')
+                return None
+            except tweepy.TweepyException as e:
+                self._note_limits('timeline', getattr(e, 'response', None))
+                metrics.errors.inc('twitter')
+                print(f"[Twitter] {user.username}: {e}")
+                return None
+            self._note_limits('timeline', response)
+            return [tweepy.Tweet(tweet) for tweet in response.json().get('data', [])]
 
 twitter_client = TwitterClient()
 
 # ==================== VOICE NOTIFICATION ====================
+class BufferedSource(discord.AudioSource):
+    """Plays pre-encoded Opus frames from a shared buffer; each playback only keeps its own position"""
+    def __init__(self, frames: List[bytes]):
+        self._frames = frames
+        self._index = 0
+    
+    def read(self) -> bytes:
+        if self._index >= len(self._frames):
+            return b''
+        frame = self._frames[self._index]
+        self._index += 1
+        return frame
+    
+    def is_opus(self) -> bool:
+        return True
+
+class NotificationSound:
+    """The notification sound, decoded by ffmpeg and Opus-encoded once for every guild"""
+    QUEUE_LIMIT = 5  # Plays waiting per guild; more are dropped
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.frames = None
+        self.failed = False
+        self._load_lock = asyncio.Lock()
+        self._pending = {}  # guild_id: plays waiting
+        self._players = {}  # guild_id: player task
+    
+    def _decode(self) -> List[bytes]:
+        # Raises OpusNotLoaded without libopus; voice cannot send anything then
+        encoder = discord.opus.Encoder()
+        pcm = subprocess.run(
+            ['ffmpeg', '-loglevel', 'error', '-i', self.path, '-f', 's16le', '-ar', '48000', '-ac', '2', 'pipe:1'],
+            capture_output=True, check=True
+        ).stdout
+        frame_size = discord.opus.Encoder.FRAME_SIZE
+        frames = [pcm[i:i + frame_size].ljust(frame_size, b'\0') for i in range(0, len(pcm), frame_size)]
+        return [encoder.encode(frame, discord.opus.Encoder.SAMPLES_PER_FRAME) for frame in frames]
+    
+    async def load(self) -> bool:
+        async with self._load_lock:
+            if self.frames is None and not self.failed:
+                if not os.path.exists(self.path):
+                    self.failed = True
+                    return False
+                try:
+                    self.frames = await asyncio.to_thread(self._decode)
+                    print(f"🔊 Bildirim sesi hazır: {len(self.frames)} kare")
+                except discord.opus.OpusNotLoaded:
+                    self.failed = True
+                    print("[Voice] libopus bulunamadı, sesli bildirimler kapalı")
+                except (OSError, subprocess.CalledProcessError) as e:
+                    self.failed = True
+                    print(f"[Voice] {self.path} çözülemedi: {e}")
+        return self.frames is not None
+    
+    def enqueue(self, guild_id: int):
+        """Queue one play for the guild; plays never overlap and are not dropped while one is running"""
+        if self._pending.get(guild_id, 0) >= self.QUEUE_LIMIT:
+            return
+        self._pending[guild_id] = self._pending.get(guild_id, 0) + 1
+        player = self._players.get(guild_id)
+        if player is None or player.done():
+            self._players[guild_id] = asyncio.create_task(self._play_queue(guild_id))
+    
+    async def _play_queue(self, guild_id: int):
+        loop = asyncio.get_running_loop()
+        while self._pending.get(guild_id):
+            self._pending[guild_id] -= 1
+            try:
+                voice_client = await get_voice_client(guild_id)
+                if voice_client is None or not await self.load():
+                    continue
+                while voice_client.is_playing():
+                    await asyncio.sleep(0.2)
+                finished = asyncio.Event()
+                voice_client.play(
+                    BufferedSource(self.frames),
+                    after=lambda error: loop.call_soon_threadsafe(finished.set)
+                )
+                await finished.wait()
+            except Exception as e:
+                print(f"[Voice] {guild_id}: {e}")
+        self._pending.pop(guild_id, None)
+
+notification_sound = NotificationSound(config.NOTIFICATION_SOUND)
+
+async def get_voice_client(guild_id: int):
+    """Connected voice client of the guild's notification channel, connecting if needed"""
+    voice_channel_id = config.bot_config.get('voice_channels', {}).get(str(guild_id))
+    if not voice_channel_id:
+        return None
+    
+    voice_channel = bot.get_channel(int(voice_channel_id))
+    if not voice_channel:
+        return None
+    
+    # Check if already connected
+    voice_client = _voice_clients.get(guild_id)
+    
+    if not voice_client or not voice_client.is_connected():
+        voice_client = await voice_channel.connect()
+        _voice_clients[guild_id] = voice_client
+    return voice_client
+
 async def play_notification_sound(guild_id: int):
     """Play notification sound in voice channel"""
-    try:
-        # Check if PyNaCl is available
-        try:
-            import nacl
-        except ImportError:
-            # Silently skip if PyNaCl not installed
-            return
+    # Silently skip if PyNaCl not installed or the guild has no voice channel
+    if not VOICE_AVAILABLE or notification_sound.failed:
+        return
+    if not config.bot_config.get('voice_channels', {}).get(str(guild_id)):
+        return
+    notification_sound.enqueue(guild_id)
+
+# ==================== FILTERS ====================
+class FilterError(ValueError):
+    """Invalid filter expression or regex"""
+
+class KeywordSet:
+    """Many keywords matched in one regex pass (longest alternative first)"""
+    def __init__(self, keywords):
+        self.keywords = sorted({k.strip().lower() for k in keywords if k.strip()}, key=len, reverse=True)
+        alternation = '|'.join(re.escape(k) for k in self.keywords)
+        self._any = re.compile(alternation)
+        # Lookahead finds the longest keyword at every position; shorter ones there are its substrings
+        self._all = re.compile(f'(?=({alternation}))')
+        self._implied = {k: frozenset(o for o in self.keywords if o != k and o in k) for k in self.keywords}
+    
+    def __bool__(self):
+        return bool(self.keywords)
+    
+    def search(self, text: str) -> bool:
+        return self._any.search(text) is not None
+    
+    def find(self, text: str) -> set:
+        hits = set(self._all.findall(text))
+        for hit in list(hits):
+            hits |= self._implied[hit]
+        return hits
+
+FILTER_TOKEN_RE = re.compile(r'''
+    \s*(?:
+        (?P<paren>[()])
+      | re:/(?P<regex>(?:\\.|[^/\\])*)/
+      | (?P<field>category|viewers)(?P<op>:|>=|<=|>|<|=)(?:"(?P<qvalue>[^"]*)"|(?P<value>[^\s()"]+))
+      | "(?P<phrase>[^"]*)"
+      | (?P<word>[^\s()"]+)
+    )''', re.VERBOSE | re.IGNORECASE)
+
+VIEWER_OPS = {
+    '>=': lambda v, n: v >= n,
+    '<=': lambda v, n: v <= n,
+    '>': lambda v, n: v > n,
+    '<': lambda v, n: v < n,
+    '=': lambda v, n: v == n
+}
+
+class FilterExpression:
+    """Compiles e.g. `turnuva AND NOT tekrar AND (viewers>=100 OR category:"just chatting")` into closures.
+    
+    Terms: word or "phrase" (title contains), re:/pattern/, category:name, viewers>=N (>, <, <=, =).
+    Operators: NOT > AND > OR, parentheses; adjacent terms are AND-ed."""
+    def __init__(self, text: str):
+        self.keywords = []
+        self._tokens = self._tokenize(text)
+        self._pos = 0
+        test = self._or()
+        if self._pos != len(self._tokens):
+            raise FilterError(f"Beklenmeyen ifade: {self._tokens[self._pos][1]}")
+        self.keyword_set = KeywordSet(self.keywords)
+        self.test = test
+    
+    @staticmethod
+    def _tokenize(text: str) -> list:
+        tokens, pos = [], 0
+        text = text.rstrip()
+        while pos < len(text):
+            match = FILTER_TOKEN_RE.match(text, pos)
+            if not match or match.end() == pos:
+                raise FilterError(f"Geçersiz ifade: {text[pos:pos + 20]}")
+            pos = match.end()
+            kind = match.lastgroup if match.lastgroup not in ('qvalue', 'value', 'op') else 'field'
+            if kind == 'word' and match.group('word').upper() in ('AND', 'OR', 'NOT'):
+                kind = match.group('word').upper()
+            tokens.append((kind, match.group(0).strip(), match))
+        return tokens
+    
+    def _peek(self) -> Optional[str]:
+        return self._tokens[self._pos][0] if self._pos < len(self._tokens) else None
+    
+    def _or(self):
+        tests = [self._and()]
+        while self._peek() == 'OR':
+            self._pos += 1
+            tests.append(self._and())
+        return tests[0] if len(tests) == 1 else (lambda f: any(t(f) for t in tests))
+    
+    def _and(self):
+        tests = [self._not()]
+        while self._peek() not in (None, 'OR') and self._tokens[self._pos][1] != ')':
+            if self._peek() == 'AND':
+                self._pos += 1
+            tests.append(self._not())
+        return tests[0] if len(tests) == 1 else (lambda f: all(t(f) for t in tests))
+    
+    def _not(self):
+        if self._peek() == 'NOT':
+            self._pos += 1
+            inner = self._not()
+            return lambda f: not inner(f)
+        return self._term()
+    
+    def _term(self):
+        if self._pos >= len(self._tokens):
+            raise FilterError("İfade eksik")
+        kind, raw, match = self._tokens[self._pos]
+        self._pos += 1
         
-        voice_channel_id = config.bot_config.get('voice_channels', {}).get(str(guild_id))
-        if not voice_channel_id:
-            return
+        if kind == 'paren':
+            if raw != '(':
+                raise FilterError("Fazla ')'")
+            inner = self._or()
+            if self._pos >= len(self._tokens) or self._tokens[self._pos][1] != ')':
+                raise FilterError("Kapanmayan '('")
+            self._pos += 1
+            return inner
         
-        voice_channel = bot.get_channel(int(voice_channel_id))
-        if not voice_channel:
-            return
+        if kind == 'regex':
+            try:
+                pattern = re.compile(match.group('regex'), re.IGNORECASE)
+            except re.error as e:
+                raise FilterError(f"Geçersiz regex: {e}")
+            return lambda f: pattern.search(f['title']) is not None
         
-        # Check if already connected
-        voice_client = _voice_clients.get(guild_id)
+        if kind == 'field':
+            field, op = match.group('field').lower(), match.group('op')
+            value = match.group('qvalue') if match.group('qvalue') is not None else match.group('value')
+            if field == 'category':
+                if op != ':':
+                    raise FilterError(f"category sadece ':' ile kullanılır: {raw}")
+                category = value.strip().lower()
+                return lambda f: category in f['categories']
+            if op not in VIEWER_OPS or not value.isdigit():
+                raise FilterError(f"Geçersiz izleyici koşulu: {raw}")
+            compare, limit = VIEWER_OPS[op], int(value)
+            return lambda f: f['viewers'] is not None and compare(f['viewers'], limit)
         
-        if not voice_client or not voice_client.is_connected():
-            voice_client = await voice_channel.connect()
-            _voice_clients[guild_id] = voice_client
+        if kind in ('phrase', 'word'):
+            keyword = (match.group('phrase') if kind == 'phrase' else match.group('word')).strip().lower()
+            if not keyword:
+                raise FilterError("Boş anahtar kelime")
+            self.keywords.append(keyword)
+            return lambda f: keyword in f['hits']
         
-        # Play sound if file exists
-        if os.path.exists(config.NOTIFICATION_SOUND):
-            if not voice_client.is_playing():
-                source = discord.FFmpegPCMAudio(config.NOTIFICATION_SOUND)
-                voice_client.play(source)
-    except Exception as e:
-        print(f"[Voice] {guild_id}: {e}")
+        raise FilterError(f"Beklenmeyen ifade: {raw}")
+
+class CompiledFilter:
+    """A subscription's filters, compiled once when they are saved"""
+    def __init__(self, filters: dict):
+        self.min_viewers = filters.get('min_viewers') or 0
+        self.max_viewers = filters.get('max_viewers') or 0
+        self.categories = frozenset(c.strip().lower() for c in filters.get('categories', []) if c.strip())
+        self.keywords = KeywordSet(filters.get('keywords', []))
+        self.exclude = KeywordSet(filters.get('exclude_keywords', []))
+        try:
+            self.regex = re.compile(filters['regex'], re.IGNORECASE) if filters.get('regex') else None
+        except re.error as e:
+            raise FilterError(f"Geçersiz regex: {e}")
+        self.expression = FilterExpression(filters['expression']) if filters.get('expression') else None
+    
+    def matches(self, is_kick: bool, title: str, viewers: Optional[int], categories) -> bool:
+        # Viewer and category conditions only apply to Kick
+        if is_kick:
+            if self.min_viewers and viewers < self.min_viewers:
+                return False
+            if self.max_viewers and viewers > self.max_viewers:
+                return False
+            if self.categories and self.categories.isdisjoint(categories):
+                return False
+        
+        lowered = title.lower()
+        if self.keywords and title and not self.keywords.search(lowered):
+            return False
+        if self.exclude and self.exclude.search(lowered):
+            return False
+        if self.regex and not self.regex.search(title):
+            return False
+        
+        if self.expression:
+            keyword_set = self.expression.keyword_set
+            return self.expression.test({
+                'title': title,
+                'hits': keyword_set.find(lowered) if keyword_set else set(),
+                'viewers': viewers,
+                'categories': categories
+            })
+        return True
+
+_compiled_filters = {}  # sub_id: CompiledFilter or None (no filter)
+config.add_listener(_compiled_filters.clear, 'filters')
+
+def get_compiled_filter(sub_id: str) -> Optional[CompiledFilter]:
+    if sub_id not in _compiled_filters:
+        filters = config.bot_config.get('filters', {}).get(sub_id)
+        compiled = None
+        if filters:
+            try:
+                compiled = CompiledFilter(filters)
+            except FilterError as e:
+                print(f"⚠️ Filtre ({sub_id}): {e}")
+        _compiled_filters[sub_id] = compiled
+    return _compiled_filters[sub_id]
 
-# ==================== FILTERS ====================
 def check_filters(sub: dict, data: dict) -> bool:
     """Check if notification should be sent based on filters"""
-    sub_id = sub.get('id')
-    filters = config.bot_config.get('filters', {}).get(sub_id)
+    compiled = get_compiled_filter(sub.get('id'))
     
-    if not filters:
+    if compiled is None:
         return True
     
-    # Check minimum viewers (Kick only)
-    if 'min_viewers' in filters and sub['type'] == 'kick':
-        livestream = data.get('livestream', {})
-        viewers = livestream.get('viewer_count', 0)
-        if viewers < filters['min_viewers']:
-            return False
-    
-    # Check categories
-    if 'categories' in filters and filters['categories']:
-        if sub['type'] == 'kick':
-            livestream = data.get('livestream', {})
-            categories = livestream.get('categories', [])
-            category_names = [c.get('name', '').lower() for c in categories]
-            if not any(cat.lower() in category_names for cat in filters['categories']):
-                return False
+    if sub['type'] == 'kick':
+        livestream = data.get('livestream') or {}
+        title = livestream.get('session_title') or ''
+        viewers = livestream.get('viewer_count') or 0
+        categories = frozenset(
+            c.get('name', '').lower() for c in livestream.get('categories') or [] if isinstance(c, dict)
+        )
+        passed = compiled.matches(True, title, viewers, categories)
+    else:
+        passed = compiled.matches(False, data.get('title') or '', None, frozenset())
     
-    # Check keywords
-    if 'keywords' in filters and filters['keywords']:
-        title = ""
-        if sub['type'] == 'kick':
-            livestream = data.get('livestream', {})
-            title = livestream.get('session_title', '').lower()
-        elif 'title' in data:
-            title = data['title'].lower()
+    if not passed:
+        metrics.filter_rejects.inc(sub['type'])
+    return passed
+
+# ==================== NOTIFICATION TEMPLATES ====================
+class MessageTemplate:
+    """Text with {placeholders}, parsed once; unknown placeholders are left as they are"""
+    def __init__(self, text: str):
+        try:
+            self.parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(text)]
+        except ValueError:
+            # Unbalanced braces: use the text literally
+            self.parts = [(text, None)]
+    
+    def render(self, values: dict) -> str:
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                # Plain lookups only, so {user.__class__} and the like stay literal text
+                value = values.get(field)
+                out.append('{' + field + '}' if value is None else str(value))
+        return ''.join(out)
+
+class NotificationTemplate:
+    """Strings and mention for one (guild, type, language), resolved from bot_config once"""
+    def __init__(self, guild_id: int, notif_type: str, lang: str):
+        texts = TRANSLATIONS[lang]
+        self.live_now = MessageTemplate(texts['live_now'])
+        self.category_label = texts['category']
+        self.viewers_label = texts['viewers']
         
-        if title and not any(keyword.lower() in title for keyword in filters['keywords']):
-            return False
-    
-    return True
+        roles = config.bot_config.get('notification_roles', {}).get(str(guild_id), {})
+        role_id = roles.get(notif_type)
+        self.mention = f"<@&{role_id}>" if role_id else "@everyone"
+
+class CustomMessage:
+    """A subscription's /ozel_mesaj settings with title and description templates"""
+    def __init__(self, custom: dict):
+        self.title = MessageTemplate(custom['title']) if custom.get('title') else None
+        self.description = MessageTemplate(custom['description']) if custom.get('description') else None
+        try:
+            self.color = int(custom['color'], 16) if custom.get('color') else None
+        except ValueError:
+            self.color = None
+    
+    def apply(self, embed: discord.Embed, values: dict) -> discord.Embed:
+        if self.title:
+            embed.title = self.title.render(values)[:256]
+        if self.description:
+            embed.description = self.description.render(values)[:4096]
+        if self.color is not None:
+            embed.color = self.color
+        return embed
+
+_templates = {}  # (guild_id, type, language): NotificationTemplate
+_custom_messages = {}  # sub_id: CustomMessage or None
+config.add_listener(_templates.clear, 'notification_roles')
+config.add_listener(_custom_messages.clear, 'custom_messages')
+
+def get_template(guild_id: int, notif_type: str) -> NotificationTemplate:
+    key = (guild_id, notif_type, guild_language(guild_id))
+    template = _templates.get(key)
+    if template is None:
+        template = _templates[key] = NotificationTemplate(*key)
+    return template
 
-# ==================== CUSTOM MESSAGES ====================
-def get_custom_embed(sub: dict, default_embed: discord.Embed) -> discord.Embed:
-    """Get custom embed if configured"""
+def get_custom_embed(sub: dict, default_embed: discord.Embed, **values) -> discord.Embed:
+    """Apply the custom message if configured; values fill {user}, {title}, {viewers}, {category}, {link}"""
     sub_id = sub.get('id')
-    custom_msg = config.bot_config.get('custom_messages', {}).get(sub_id)
+    if sub_id not in _custom_messages:
+        custom_msg = config.bot_config.get('custom_messages', {}).get(sub_id)
+        _custom_messages[sub_id] = CustomMessage(custom_msg) if custom_msg else None
     
-    if not custom_msg:
+    custom = _custom_messages[sub_id]
+    if custom is None:
         return default_embed
-    
-    if 'title' in custom_msg:
-        default_embed.title = custom_msg['title']
-    if 'description' in custom_msg:
-        default_embed.description = custom_msg['description']
-    if 'color' in custom_msg:
-        default_embed.color = int(custom_msg['color'], 16)
-    
-    return default_embed
+    return custom.apply(default_embed, values)
 
-# ==================== MENTION HELPER ====================
 def get_mention_string(guild_id: int, notif_type: str) -> str:
     """Get mention string based on role configuration"""
-    roles = config.bot_config.get('notification_roles', {}).get(str(guild_id), {})
-    role_id = roles.get(notif_type)
+    return get_template(guild_id, notif_type).mention
+
+# ==================== NOTIFICATION DISPATCH ====================
+class NotificationDispatcher:
+    """Delivers notifications off the polling path, one channel bucket at a time"""
+    MAX_EMBEDS = 10  # Discord limits per message
+    MAX_EMBED_CHARS = 6000
+    MAX_CONTENT = 2000
+    
+    def __init__(self, queue_size: int, workers: int, batch_window: float, max_retries: int):
+        self.worker_count = workers
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self._capacity = asyncio.Semaphore(queue_size)
+        self._ready = asyncio.Queue()  # (channel_id, due) of buckets waiting for a worker
+        self._buckets = {}  # channel_id: deque of pending notifications, oldest first
+        self._tasks = []
+        self._sound_tasks = set()
+        self.sent_messages = 0
+        self.sent_embeds = 0
+        self.retries = 0
+        self.dropped = 0
+    
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.worker_count)]
+    
+    async def enqueue(self, channel, content: str, embed: discord.Embed, guild_id: Optional[int], notif_type: str, title: str):
+        """Queue a notification; only waits when the queue is full"""
+        self.start()
+        await self._capacity.acquire()
+        bucket = self._buckets.get(channel.id)
+        if bucket is None:
+            # A channel is owned by one worker at a time, so its messages stay in order
+            bucket = self._buckets[channel.id] = deque()
+            self._ready.put_nowait((channel.id, time_module.monotonic() + self.batch_window))
+        bucket.append({
+            'channel': channel,
+            'content': content,
+            'embed': embed,
+            'guild_id': guild_id,
+            'type': notif_type,
+            'title': title
+        })
     
-    if role_id:
-        return f"<@&{role_id}>"
+    def pending(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+    
+    def _take_batch(self, bucket: deque) -> list:
+        batch, size = [], 0
+        while bucket and len(batch) < self.MAX_EMBEDS:
+            embed_size = len(bucket[0]['embed'])
+            if batch and size + embed_size > self.MAX_EMBED_CHARS:
+                break
+            size += embed_size
+            batch.append(bucket.popleft())
+        return batch
+    
+    async def _work(self):
+        while True:
+            channel_id, due = await self._ready.get()
+            delay = due - time_module.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            
+            bucket = self._buckets[channel_id]
+            batch = self._take_batch(bucket)
+            try:
+                await self._deliver(batch)
+            except discord.HTTPException as e:
+                if len(batch) > 1 and 400 <= e.status < 500:
+                    # One bad item (e.g. an oversized embed) fails the merged message: send them one by one
+                    await self._deliver_each(batch)
+                else:
+                    self._drop(batch, e)
+            except Exception as e:
+                self._drop(batch, e)
+            finally:
+                for _ in batch:
+                    self._capacity.release()
+                if bucket:
+                    self._ready.put_nowait((channel_id, time_module.monotonic()))
+                else:
+                    del self._buckets[channel_id]
+    
+    def _drop(self, batch: list, error: Exception):
+        self.dropped += len(batch)
+        metrics.errors.inc('discord', amount=len(batch))
+        print(f"❌ Bildirim ({batch[0]['channel'].id}): {error}")
+    
+    async def _deliver_each(self, batch: list):
+        for item in batch:
+            try:
+                await self._deliver([item])
+            except Exception as e:
+                self._drop([item], e)
     
-    return "@everyone"
+    async def _deliver(self, batch: list):
+        channel = batch[0]['channel']
+        # Same mention for several items is sent once
+        content = '\n'.join(dict.fromkeys(item['content'] for item in batch if item['content']))
+        embeds = [item['embed'] for item in batch]
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                with metrics.send_duration.time():
+                    await channel.send(content[:self.MAX_CONTENT] or None, embeds=embeds)
+                break
+            except discord.HTTPException as e:
+                # 429 and 5xx are worth another try, anything else (Forbidden, bad embed) is final
+                if attempt == self.max_retries or not (e.status == 429 or e.status >= 500):
+                    raise
+                delay = getattr(e, 'retry_after', None) or min(2 ** attempt, 30)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                delay = min(2 ** attempt, 30)
+            self.retries += 1
+            await asyncio.sleep(delay + random.uniform(0, 0.5))
+        
+        self.sent_messages += 1
+        self.sent_embeds += len(batch)
+        for item in batch:
+            stats.add_notification(item['type'], item['title'], channel.id, item['guild_id'])
+            metrics.notifications.inc(item['type'])
+        
+        # One sound per guild and message; playback must not hold the worker
+        for guild_id in dict.fromkeys(item['guild_id'] for item in batch):
+            task = asyncio.create_task(play_notification_sound(guild_id))
+            self._sound_tasks.add(task)
+            task.add_done_callback(self._sound_tasks.discard)
+    
+    def describe(self) -> str:
+        return (f"{self.sent_messages} mesaj / {self.sent_embeds} embed, {self.pending()} bekleyen, "
+                f"{self.retries} tekrar, {self.dropped} kayıp")
+    
+    async def close(self, timeout: float = 10):
+        # Give queued notifications a chance to go out before disconnecting
+        deadline = time_module.monotonic() + timeout
+        while self._buckets and self._tasks and time_module.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+notification_dispatcher = NotificationDispatcher(
+    config.DISPATCH_QUEUE_SIZE,
+    config.DISPATCH_WORKERS,
+    config.DISPATCH_BATCH_WINDOW,
+    config.DISPATCH_MAX_RETRIES
+)
 
 # ==================== BOT EVENTS ====================
+_startup_done = False  # on_ready fires again after reconnects; startup work runs once
+
+def command_schema_hash() -> str:
+    """Fingerprint of the slash command definitions for this application"""
+    commands_data = sorted((cmd.to_dict() for cmd in tree.get_commands()), key=lambda c: c['name'])
+    payload = json.dumps({'application_id': bot.application_id, 'commands': commands_data}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+async def sync_commands():
+    """Global tree.sync only when the command definitions changed since the last successful sync"""
+    schema_hash = command_schema_hash()
+    if not config.FORCE_COMMAND_SYNC and runtime_cache.get('command_hash') == schema_hash:
+        print("ℹ️ Komutlar değişmedi, sync atlandı")
+        return
+    try:
+        synced = await tree.sync()
+    except discord.HTTPException as e:
+        # Keep the old hash so the next start tries again
+        print(f"❌ Komut sync: {e}")
+        return
+    runtime_cache.set('command_hash', schema_hash)
+    print(f"✅ {len(synced)} komut senkronize edildi")
+
 @bot.event
 async def on_ready():
+    global _startup_done
+    if _startup_done:
+        # Gateway reconnect: loops, voice and migration are already in place
+        print(f'🔄 {bot.user} yeniden bağlandı')
+        return
+    _startup_done = True
+    
+    startup_profile.mark('login')
     print(f'✅ {bot.user} aktif')
     print(f'🌍 Dil: {config.DEFAULT_LANGUAGE.upper()}')
     print(f'⏱️ Kontrol: {config.CHECK_INTERVAL}s')
     print(f'🧪 Test Modu: {config.TEST_MODE}')
     
-    # Auto-migrate old subscriptions (add guild_id)
-    await migrate_old_subscriptions()
+    # Startup runs once (see _startup_done), so every step is guarded: the loops below must always start
+    try:
+        # Auto-migrate old subscriptions (add guild_id)
+        await migrate_old_subscriptions()
+        
+        # Kick may need Firefox: find geckodriver in the background instead of before readiness
+        if config.KICK_FETCH_MODE != 'http' and any(key.startswith('kick:') for key in get_registry().by_source):
+            geckodriver.prefetch()
+    except Exception as e:
+        print(f"❌ Migration: {e}")
+    startup_profile.mark('subscriptions')
     
     try:
-        await asyncio.to_thread(GeckoDriverManager().install)
-        print("✅ GeckoDriver hazır")
+        await sync_commands()
     except Exception as e:
-        print(f"❌ GeckoDriver: {e}")
+        print(f"❌ Komut sync: {e}")
+    startup_profile.mark('command sync')
     
-    await tree.sync()
-    check_feeds.start()
+    notification_dispatcher.start()
+    try:
+        await metrics_server.start()
+    except Exception as e:
+        print(f"❌ Metrics: {e}")
+    if not check_feeds.is_running():
+        check_feeds.start()
+    if not flush_state.is_running():
+        flush_state.start()
+    startup_profile.mark('tasks')
     
     # Join voice channels on startup
     for guild_id_str, voice_channel_id in config.bot_config.get('voice_channels', {}).items():
@@ -436,14 +2775,23 @@ async def on_ready():
         except Exception as e:
             print(f"[Voice Connect] {guild_id_str}: {e}")
     
+    # Decode the notification sound once, before the first notification needs it
+    if VOICE_AVAILABLE and config.bot_config.get('voice_channels'):
+        try:
+            await notification_sound.load()
+        except Exception as e:
+            print(f"❌ Bildirim sesi: {e}")
+    startup_profile.mark('voice')
+    
     print("✅ Bot hazır!")
+    startup_profile.report()
 
 async def migrate_old_subscriptions():
     """Auto-migrate old subscriptions without guild_id"""
-    subscriptions = load_subscriptions()
+    registry = get_registry()
     changed = False
     
-    for sub in subscriptions:
+    for sub in registry.for_guild(None):
         # Skip if already has guild_id
         if sub.get('guild_id'):
             continue
@@ -453,13 +2801,14 @@ async def migrate_old_subscriptions():
         if channel_id:
             channel = bot.get_channel(channel_id)
             if channel and hasattr(channel, 'guild'):
-                sub['guild_id'] = channel.guild.id
+                registry.update(sub, guild_id=channel.guild.id)
+                state_writer.mark(sub)
                 changed = True
                 print(f"🔄 Migration: {sub.get('id', 'unknown')[:30]} → Guild {channel.guild.name}")
     
     if changed:
-        await save_subscriptions(subscriptions)
-        print(f"✅ {sum(1 for s in subscriptions if s.get('guild_id'))} abonelik migration tamamlandı")
+        await state_writer.flush()
+        print(f"✅ {len(registry) - len(registry.for_guild(None))} abonelik migration tamamlandı")
     else:
         print("ℹ️ Migration gerekmiyor")
 
@@ -488,7 +2837,7 @@ async def on_voice_state_update(member, before, after):
 # ==================== SLASH COMMANDS ====================
 @tree.command(name="help", description="Bot komutları")
 async def help_cmd(interaction: discord.Interaction):
-    lang = config.bot_config.get('languages', {}).get(str(interaction.guild_id), config.DEFAULT_LANGUAGE)
+    lang = guild_language(interaction.guild_id)
     
     embed = discord.Embed(
         title=get_text('help_title', interaction.guild_id),
@@ -540,14 +2889,6 @@ async def help_cmd(interaction: discord.Interaction):
 @tree.command(name="kick_ekle", description="Kick kanalı takip et")
 async def kick_add(interaction: discord.Interaction, kullanici_adi: str, kanal: discord.TextChannel):
     kullanici_adi = kullanici_adi.lower().strip()
-    subscriptions = load_subscriptions()
-    
-    if any(s.get('type') == 'kick' and s.get('username') == kullanici_adi and s['discord_channel_id'] == kanal.id for s in subscriptions):
-        await interaction.response.send_message(
-            get_text('already_exists', interaction.guild_id),
-            ephemeral=True
-        )
-        return
     
     new_sub = {
         'type': 'kick',
@@ -557,8 +2898,15 @@ async def kick_add(interaction: discord.Interaction, kullanici_adi: str, kanal:
         'guild_id': interaction.guild_id,
         'was_live': False
     }
-    subscriptions.append(new_sub)
-    await save_subscriptions(subscriptions)
+    
+    if get_registry().exists(new_sub):
+        await interaction.response.send_message(
+            get_text('already_exists', interaction.guild_id),
+            ephemeral=True
+        )
+        return
+
+    await add_subscription(new_sub)
     await interaction.response.send_message(f"✅ Kick: `{kullanici_adi}` → <#{kanal.id}>")
 
 @tree.command(name="youtube_ekle", description="YouTube kanalı takip et")
@@ -570,11 +2918,6 @@ async def youtube_add(interaction: discord.Interaction, channel_id: str, kanal:
         return
     
     feed_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-    subscriptions = load_subscriptions()
-    
-    if any(s.get('url') == feed_url and s['discord_channel_id'] == kanal.id for s in subscriptions):
-        await interaction.response.send_message(get_text('already_exists', interaction.guild_id), ephemeral=True)
-        return
     
     new_sub = {
         'type': 'youtube',
@@ -584,18 +2927,17 @@ async def youtube_add(interaction: discord.Interaction, channel_id: str, kanal:
         'guild_id': interaction.guild_id,
         'last_entry_id': None
     }
-    subscriptions.append(new_sub)
-    await save_subscriptions(subscriptions)
+    
+    if get_registry().exists(new_sub):
+        await interaction.response.send_message(get_text('already_exists', interaction.guild_id), ephemeral=True)
+        return
+
+    await add_subscription(new_sub)
     await interaction.response.send_message(f"✅ YouTube: `{channel_id}` → <#{kanal.id}>")
 
 @tree.command(name="feed_ekle", description="RSS/Atom feed takip et")
 async def feed_add(interaction: discord.Interaction, feed_url: str, kanal: discord.TextChannel):
     feed_url = feed_url.strip()
-    subscriptions = load_subscriptions()
-    
-    if any(s.get('url') == feed_url and s['discord_channel_id'] == kanal.id for s in subscriptions):
-        await interaction.response.send_message(get_text('already_exists', interaction.guild_id), ephemeral=True)
-        return
     
     new_sub = {
         'type': 'rss',
@@ -605,8 +2947,12 @@ async def feed_add(interaction: discord.Interaction, feed_url: str, kanal: disco
         'guild_id': interaction.guild_id,
         'last_entry_id': None
     }
-    subscriptions.append(new_sub)
-    await save_subscriptions(subscriptions)
+    
+    if get_registry().exists(new_sub):
+        await interaction.response.send_message(get_text('already_exists', interaction.guild_id), ephemeral=True)
+        return
+
+    await add_subscription(new_sub)
     await interaction.response.send_message(f"✅ RSS: `{feed_url}` → <#{kanal.id}>")
 
 @tree.command(name="twitter_ekle", description="Twitter hesabı takip et")
@@ -620,11 +2966,6 @@ async def twitter_add(interaction: discord.Interaction, kullanici_adi: str, kana
         return
     
     kullanici_adi = kullanici_adi.strip().replace('@', '')
-    subscriptions = load_subscriptions()
-    
-    if any(s.get('type') == 'twitter' and s.get('username') == kullanici_adi and s['discord_channel_id'] == kanal.id for s in subscriptions):
-        await interaction.response.send_message(get_text('already_exists', interaction.guild_id), ephemeral=True)
-        return
     
     new_sub = {
         'type': 'twitter',
@@ -634,16 +2975,18 @@ async def twitter_add(interaction: discord.Interaction, kullanici_adi: str, kana
         'guild_id': interaction.guild_id,
         'last_tweet_id': None
     }
-    subscriptions.append(new_sub)
-    await save_subscriptions(subscriptions)
+    
+    if get_registry().exists(new_sub):
+        await interaction.response.send_message(get_text('already_exists', interaction.guild_id), ephemeral=True)
+        return
+
+    await add_subscription(new_sub)
     await interaction.response.send_message(f"✅ Twitter: `@{kullanici_adi}` → <#{kanal.id}>")
 
 @tree.command(name="abonelikleri_listele", description="Tüm abonelikleri listele")
 async def list_subs(interaction: discord.Interaction):
-    subscriptions = load_subscriptions()
-    
     # Backward compatibility: filter by guild OR show all if no guild_id exists
-    guild_subs = [s for s in subscriptions if s.get('guild_id') == interaction.guild_id or not s.get('guild_id')]
+    guild_subs = get_registry().for_guild(interaction.guild_id, include_unassigned=True)
     
     if not guild_subs:
         await interaction.response.send_message(get_text('no_subs', interaction.guild_id), ephemeral=True)
@@ -671,10 +3014,8 @@ async def list_subs(interaction: discord.Interaction):
 
 @tree.command(name="abonelik_sil", description="Abonelik sil")
 async def del_sub(interaction: discord.Interaction, numara: int):
-    subscriptions = load_subscriptions()
-    
     # Backward compatibility: filter by guild OR show all if no guild_id exists
-    guild_subs = [s for s in subscriptions if s.get('guild_id') == interaction.guild_id or not s.get('guild_id')]
+    guild_subs = get_registry().for_guild(interaction.guild_id, include_unassigned=True)
     
     index = numara - 1
     if not (0 <= index < len(guild_subs)):
@@ -682,8 +3023,7 @@ async def del_sub(interaction: discord.Interaction, numara: int):
         return
     
     removed = guild_subs[index]
-    subscriptions = [s for s in subscriptions if s != removed]
-    await save_subscriptions(subscriptions)
+    await remove_subscription(removed)
     
     sub_id = removed.get('username') or removed.get('id', 'N/A')
     await interaction.response.send_message(f"{get_text('removed', interaction.guild_id)}: `{sub_id}`")
@@ -691,7 +3031,7 @@ async def del_sub(interaction: discord.Interaction, numara: int):
 @tree.command(name="sesli_kanal_ayarla", description="Bildirim için sesli kanal ayarla")
 async def set_voice(interaction: discord.Interaction, kanal: discord.VoiceChannel):
     config.bot_config.setdefault('voice_channels', {})[str(interaction.guild_id)] = kanal.id
-    config.save_bot_config(config.bot_config)
+    config.save_bot_config(config.bot_config, 'voice_channels')
     
     # Join voice channel
     try:
@@ -708,14 +3048,14 @@ async def set_role(interaction: discord.Interaction, tip: str, rol: discord.Role
         return
     
     config.bot_config.setdefault('notification_roles', {}).setdefault(str(interaction.guild_id), {})[tip] = rol.id
-    config.save_bot_config(config.bot_config)
+    config.save_bot_config(config.bot_config, 'notification_roles')
     
     await interaction.response.send_message(f"{get_text('role_set', interaction.guild_id)}: {rol.mention} → `{tip}`")
 
 @tree.command(name="filtre_ayarla", description="Abonelik filtresi ayarla")
-async def set_filter(interaction: discord.Interaction, abonelik_id: str, min_izleyici: int = 0, kategoriler: str = "", anahtar_kelimeler: str = ""):
-    subscriptions = load_subscriptions()
-    sub = next((s for s in subscriptions if s.get('id') == abonelik_id or s.get('username') == abonelik_id), None)
+async def set_filter(interaction: discord.Interaction, abonelik_id: str, min_izleyici: int = 0, kategoriler: str = "", anahtar_kelimeler: str = "",
+                     max_izleyici: int = 0, haric_kelimeler: str = "", regex: str = "", ifade: str = ""):
+    sub = get_registry().find(abonelik_id)
     
     if not sub:
         await interaction.response.send_message("❌ Abonelik bulunamadı", ephemeral=True)
@@ -732,15 +3072,33 @@ async def set_filter(interaction: discord.Interaction, abonelik_id: str, min_izl
     if anahtar_kelimeler:
         filter_config['keywords'] = [k.strip() for k in anahtar_kelimeler.split(',')]
     
+    if max_izleyici > 0:
+        filter_config['max_viewers'] = max_izleyici
+    
+    if haric_kelimeler:
+        filter_config['exclude_keywords'] = [k.strip() for k in haric_kelimeler.split(',')]
+    
+    if regex:
+        filter_config['regex'] = regex
+    
+    if ifade:
+        filter_config['expression'] = ifade
+    
+    # Compile now so a broken regex or expression is reported instead of saved
+    try:
+        CompiledFilter(filter_config)
+    except FilterError as e:
+        await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+        return
+    
     config.bot_config.setdefault('filters', {})[sub['id']] = filter_config
-    config.save_bot_config(config.bot_config)
+    config.save_bot_config(config.bot_config, 'filters')
     
     await interaction.response.send_message(f"{get_text('filter_set', interaction.guild_id)}: `{abonelik_id}`")
 
 @tree.command(name="ozel_mesaj", description="Özel bildirim mesajı ayarla")
 async def custom_msg(interaction: discord.Interaction, abonelik_id: str, baslik: str = "", aciklama: str = "", renk: str = ""):
-    subscriptions = load_subscriptions()
-    sub = next((s for s in subscriptions if s.get('id') == abonelik_id or s.get('username') == abonelik_id), None)
+    sub = get_registry().find(abonelik_id)
     
     if not sub:
         await interaction.response.send_message("❌ Abonelik bulunamadı", ephemeral=True)
@@ -758,7 +3116,7 @@ async def custom_msg(interaction: discord.Interaction, abonelik_id: str, baslik:
         custom_config['color'] = renk.replace('#', '')
     
     config.bot_config.setdefault('custom_messages', {})[sub['id']] = custom_config
-    config.save_bot_config(config.bot_config)
+    config.save_bot_config(config.bot_config, 'custom_messages')
     
     await interaction.response.send_message(f"{get_text('custom_msg_set', interaction.guild_id)}: `{abonelik_id}`")
 
@@ -768,7 +3126,7 @@ async def summary(interaction: discord.Interaction, sure: int = 24):
         await interaction.response.send_message("❌ Geçersiz süre (24/168/720 saat)", ephemeral=True)
         return
     
-    summary_data = stats.get_summary(sure)
+    summary_data = stats.get_summary(sure, interaction.guild_id)
     
     embed = discord.Embed(
         title=get_text('summary_title', interaction.guild_id),
@@ -795,8 +3153,7 @@ async def bot_stats(interaction: discord.Interaction):
     uptime_seconds = int(time_module.time() - stats.start_time)
     uptime_str = f"{uptime_seconds // 3600}s {(uptime_seconds % 3600) // 60}d"
     
-    subscriptions = load_subscriptions()
-    guild_subs = [s for s in subscriptions if s.get('guild_id') == interaction.guild_id]
+    guild_subs = get_registry().for_guild(interaction.guild_id)
     
     embed = discord.Embed(title="📊 Bot İstatistikleri", color=discord.Color.green())
     embed.add_field(name=get_text('uptime', interaction.guild_id), value=uptime_str, inline=True)
@@ -807,8 +3164,17 @@ async def bot_stats(interaction: discord.Interaction):
     voice_connected = interaction.guild_id in _voice_clients and _voice_clients[interaction.guild_id].is_connected()
     embed.add_field(name="🔊 Sesli Kanal", value="✅ Bağlı" if voice_connected else "❌ Bağlı değil", inline=True)
     
+    # Shared HTTP pool
+    pool = http_sessions.pool_stats()
+    embed.add_field(
+        name="🌐 HTTP Havuzu",
+        value=(f"İstek: {pool['requests']} | Yeni bağlantı: {pool['connections_created']}\n"
+               f"Yeniden kullanım: %{pool['reuse_ratio'] * 100:.0f} | DNS cache: %{pool['dns_hit_ratio'] * 100:.0f}"),
+        inline=False
+    )
+    
     # Recent notifications
-    recent = stats.data['history'][-5:]
+    recent = stats.recent(5)
     if recent:
         recent_str = '\n'.join([f"`{n['type']}`: {n['title'][:30]}..." for n in reversed(recent)])
         embed.add_field(name="📜 Son Bildirimler", value=recent_str, inline=False)
@@ -822,7 +3188,7 @@ async def change_lang(interaction: discord.Interaction, dil: str):
         return
     
     config.bot_config.setdefault('languages', {})[str(interaction.guild_id)] = dil
-    config.save_bot_config(config.bot_config)
+    config.save_bot_config(config.bot_config, 'languages')
     
     await interaction.response.send_message(f"{get_text('language_set', interaction.guild_id)}: `{dil.upper()}`")
 
@@ -843,32 +3209,145 @@ async def test_notif(interaction: discord.Interaction, kanal: discord.TextChanne
     await interaction.response.send_message(f"✅ Test bildirimi gönderildi: {kanal.mention}", ephemeral=True)
 
 # ==================== BACKGROUND TASKS ====================
-@tasks.loop(seconds=config.CHECK_INTERVAL)
+class CycleRunner:
+    """Runs Kick, feeds and Twitter as separate tasks so a slow subsystem never holds up the others"""
+    SUBSYSTEMS = {'kick': ('kick',), 'feeds': ('youtube', 'rss'), 'twitter': ('twitter',)}
+    
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._tasks = {}  # subsystem: running task
+        self._carry = {name: deque() for name in self.SUBSYSTEMS}  # Source keys waiting for the next run
+        self._carried = set()
+        self._types = {t: name for name, types in self.SUBSYSTEMS.items() for t in types}
+    
+    @staticmethod
+    def _checker(name: str):
+        return {'kick': check_kick_streams, 'feeds': check_rss_feeds, 'twitter': check_twitter_accounts}[name]
+    
+    def busy(self, name: str) -> bool:
+        task = self._tasks.get(name)
+        return task is not None and not task.done()
+    
+    def waiting(self) -> bool:
+        """True while carried or queued keys still wait for their subsystem"""
+        return any(self._carry.values())
+    
+    def submit(self, due_keys: List[str]):
+        """Queue due sources behind the carried ones and start every subsystem that is free"""
+        source_types = get_registry().source_types()
+        for key in due_keys:
+            name = self._types.get(source_types.get(key))
+            if name is not None and key not in self._carried:
+                self._carry[name].append(key)
+                self._carried.add(key)
+        
+        for name, waiting in self._carry.items():
+            if not waiting:
+                continue
+            if self.busy(name):
+                if config.TEST_MODE:
+                    print(f"🟡 {name}: önceki çalışma sürüyor, {len(waiting)} kaynak bekliyor")
+                continue
+            keys = list(waiting)
+            waiting.clear()
+            self._carried.difference_update(keys)
+            self._tasks[name] = asyncio.create_task(self._run(name, keys))
+    
+    async def _run(self, name: str, keys: List[str]):
+        registry = get_registry()
+        subs = [sub for key in keys for sub in registry.source(key)]
+        started = time_module.monotonic()
+        cut_off = False
+        try:
+            await asyncio.wait_for(self._checker(name)(subs), self.timeout)
+        except asyncio.TimeoutError:
+            cut_off = True
+        except Exception as e:
+            print(f"❌ {name} döngüsü: {e}")
+        
+        unfinished = source_scheduler.unreported(keys)
+        if cut_off:
+            # Never reached in time: these go first next run (the scheduler still has them in flight)
+            self._carry[name].extendleft(reversed(unfinished))
+            self._carried.update(unfinished)
+            metrics.carried_over.inc(name, amount=len(unfinished))
+        else:
+            source_scheduler.finish(unfinished)
+        
+        # Persist every cursor change of this run in one write
+        await state_writer.flush()
+        
+        elapsed = time_module.monotonic() - started
+        metrics.cycle_duration.observe(elapsed, name)
+        metrics.last_cycle.set(elapsed, name)
+        if cut_off or elapsed > config.CHECK_INTERVAL:
+            metrics.cycle_overruns.inc(name)
+            note = f", {len(unfinished)} kaynak sonraki çalışmaya kaldı" if cut_off else ''
+            print(f"🟡 {name}: {len(keys)} kaynak {elapsed:.1f}s sürdü (aralık {config.CHECK_INTERVAL}s){note}")
+        
+        if config.TEST_MODE:
+            print(f"💾 Durum: {state_writer.last_flush['rows']} satır, {state_writer.last_flush['bytes']} bayt "
+                  f"(toplam {state_writer.flushes} flush, {state_writer.bytes_written} bayt)")
+            print(f"💾 Config: {config.writer.describe()} | Stats: {stats.writer.describe()}")
+            print(f"📨 Gönderim: {notification_dispatcher.describe()}")
+            pool = http_sessions.pool_stats()
+            print(f"🌐 HTTP havuzu: {pool['requests']} istek, {pool['connections_created']} yeni / "
+                  f"{pool['connections_reused']} yeniden kullanılan bağlantı, {pool['in_flight']} aktif")
+    
+    async def wait(self):
+        """Until every running subsystem has finished (load tests, shutdown)"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        await self.wait()
+        self._tasks.clear()
+
+cycle_runner = CycleRunner(config.CYCLE_TIMEOUT)
+
+async def with_source_budget(coro, name: str, source_type: str):
+    """Await one source check for at most SOURCE_TIMEOUT; a straggler is cancelled and returns None"""
+    try:
+        return await asyncio.wait_for(coro, config.SOURCE_TIMEOUT)
+    except asyncio.TimeoutError:
+        metrics.timeouts.inc(source_type)
+        print(f"⏱️ {source_type} ({name}): {config.SOURCE_TIMEOUT:g}s içinde bitmedi, iptal edildi")
+        return None
+
+@tasks.loop(seconds=config.SCHEDULER_TICK)
 async def check_feeds():
     await bot.wait_until_ready()
-    subscriptions = load_subscriptions()
+    registry = get_registry()
     
-    if not subscriptions:
+    if not registry:
         return
     
-    if config.TEST_MODE:
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        print(f"[{timestamp}] 🧪 TEST MODE | {len(subscriptions)} subs")
+    # Only poll the sources whose own interval has elapsed
+    if source_scheduler.synced_version != registry.version:
+        source_scheduler.sync(registry.source_types())
+        source_scheduler.synced_version = registry.version
+    due_keys = source_scheduler.pop_due()
     
-    kick_subs = [s for s in subscriptions if s['type'] == 'kick']
-    feed_subs = [s for s in subscriptions if s['type'] in ['youtube', 'rss']]
-    twitter_subs = [s for s in subscriptions if s['type'] == 'twitter']
+    if not due_keys:
+        # Carried keys have no heap entry, so they must be restarted from here
+        if cycle_runner.waiting():
+            cycle_runner.submit(due_keys)
+        return
     
-    tasks_list = []
-    if kick_subs:
-        tasks_list.append(check_kick_streams(kick_subs))
-    if feed_subs:
-        tasks_list.append(check_rss_feeds(feed_subs))
-    if twitter_subs:
-        tasks_list.append(check_twitter_accounts(twitter_subs))
+    if config.TEST_MODE:
+        timestamp = datetime.now().strftime('%H:%M:%S')
+        print(f"[{timestamp}] 🧪 TEST MODE | {len(due_keys)}/{len(registry.by_source)} kaynak")
     
-    if tasks_list:
-        await asyncio.gather(*tasks_list, return_exceptions=True)
+    # Each subsystem runs on its own; a tick never waits for them
+    cycle_runner.submit(due_keys)
+
+@tasks.loop(seconds=config.STATE_FLUSH_INTERVAL)
+async def flush_state():
+    # Safety net for changes made outside a check cycle
+    await state_writer.flush()
 
 # ==================== KICK CHECKER ====================
 async def check_kick_streams(kick_subs):
@@ -876,176 +3355,238 @@ async def check_kick_streams(kick_subs):
     if not kick_subs:
         return
     
-    driver = None
     try:
-        options = FirefoxOptions()
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")  # Reduce memory usage
-        options.add_argument("--disable-extensions")
-        options.add_argument("--disable-images")  # Don't load images
-        options.page_load_strategy = 'eager'
+        # Fan channels out to concurrent workers; the shared rate limiter replaces fixed sleeps.
+        # Each username is fetched once, however many subscriptions follow it.
+        sources = group_by_source(kick_subs)
+        queue = asyncio.Queue()
+        for subs in sources.values():
+            queue.put_nowait(subs)
         
-        # Set memory and cache limits
-        options.set_preference("browser.cache.disk.enable", False)
-        options.set_preference("browser.cache.memory.enable", False)
+        worker_count = max(1, min(config.KICK_WORKERS, len(sources)))
+        kick_fetch_paths.clear()
         
-        binary = '/usr/lib/firefox-esr/firefox-esr'
-        if os.path.exists(binary):
-            options.binary_location = binary
+        session = http_sessions.get()
         
-        driver = await asyncio.to_thread(
-            lambda: webdriver.Firefox(service=FirefoxService(), options=options)
+        started = time_module.monotonic()
+        results = await asyncio.gather(
+            *(kick_worker(worker_id, queue, session) for worker_id in range(1, worker_count + 1)),
+            return_exceptions=True
         )
+        elapsed = time_module.monotonic() - started
+        report_kick_cycle(len(sources), elapsed, results)
+    
+    except Exception as e:
+        print(f"❌ Kick genel hata: {e}")
+
+async def kick_worker(worker_id: int, queue: asyncio.Queue, session: aiohttp.ClientSession) -> Dict:
+    """Drain the shared channel queue, returning this worker's throughput numbers"""
+    processed = 0
+    busy = 0.0
+    while True:
+        try:
+            subs = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
         
-        subscriptions = load_subscriptions()
+        await rate_limiter.wait('kick.com')
+        t0 = time_module.monotonic()
+        username = subs[0]['username']
+        outcome = 'error'
+        try:
+            with metrics.fetch_duration.time('kick'):
+                data = await with_source_budget(get_kick_channel_data(username, session), username, 'kick')
+            if data is not None:
+                outcome = 'idle'
+            else:
+                metrics.errors.inc('kick')
+            for sub in subs:
+                try:
+                    if await process_kick_data(sub, data):
+                        outcome = 'activity'
+                except Exception as e:
+                    print(f"❌ Kick ({username} → {sub.get('discord_channel_id')}): {e}")
+        except Exception as e:
+            print(f"❌ Kick ({username}): {e}")
+        source_scheduler.record(source_key(subs[0]), outcome)
+        busy += time_module.monotonic() - t0
+        processed += 1
+    
+    return {'worker': worker_id, 'channels': processed, 'busy': busy}
+
+def report_kick_cycle(channel_count: int, elapsed: float, results: list):
+    """Log per-worker throughput and warn when a cycle overruns the interval"""
+    workers = [r for r in results if isinstance(r, dict)]
+    kick_cycle_stats.update({
+        'channels': channel_count,
+        'elapsed': elapsed,
+        'workers': workers,
+        'paths': dict(kick_fetch_paths),
+    })
+    
+    if config.TEST_MODE or elapsed > config.CHECK_INTERVAL:
+        per_worker = ', '.join(
+            f"#{w['worker']} {w['channels']} kanal ({w['channels'] / elapsed if elapsed else 0:.1f}/s, {w['busy']:.1f}s meşgul)"
+            for w in workers
+        )
+        paths = ', '.join(f"{path} {count}" for path, count in sorted(kick_fetch_paths.items()))
+        icon = '🟡' if elapsed > config.CHECK_INTERVAL else '📊'
+        print(f"{icon} Kick döngüsü: {channel_count} kanal / {elapsed:.1f}s | {per_worker} | {paths}")
+
+async def process_kick_data(sub: dict, data) -> bool:
+    """Returns True when the stream went live or ended for this subscriber"""
+    username = sub['username']
+    
+    # Handle None data
+    if data is None:
+        return False
+    
+    # Validate data structure
+    if not isinstance(data, dict):
+        return False
+    
+    # Safely get livestream data
+    livestream = data.get('livestream') if data else None
+    is_live = livestream is not None and isinstance(livestream, dict)
+    was_live = sub.get('was_live', False)
+    
+    if is_live and not was_live:
+        # Check filters - double check livestream is valid
+        if not livestream:
+            return False
+            
+        if not check_filters(sub, {'livestream': livestream}):
+            print(f"🎯 Kick filtre engelledi: {username}")
+            return False
         
-        # Process Kick streams with small delays between requests
-        for idx, sub in enumerate(kick_subs):
-            username = sub['username']
-            data = await asyncio.to_thread(get_kick_channel_data_with_driver, driver, username)
+        channel = bot.get_channel(sub['discord_channel_id'])
+        if channel:
+            # Safely extract user data
+            user_data = data.get('user') if data else {}
+            if not isinstance(user_data, dict):
+                user_data = {}
             
-            # Handle None data
-            if data is None:
-                continue
+            # Safely get values with defaults
+            display_username = user_data.get('username', username)
+            session_title = livestream.get('session_title', 'Başlıksız')
+            profile_pic = user_data.get('profile_pic')
+            viewer_count = livestream.get('viewer_count', 0)
+            template = get_template(sub.get('guild_id', 0), 'kick')
             
-            # Validate data structure
-            if not isinstance(data, dict):
-                continue
+            embed = discord.Embed(
+                title=template.live_now.render({'user': display_username}),
+                url=f"https://kick.com/{username}",
+                description=f"**{session_title}**",
+                color=0x53FC18
+            )
+            embed.set_author(name="Kick.com")
             
-            # Safely get livestream data
-            livestream = data.get('livestream') if data else None
-            is_live = livestream is not None and isinstance(livestream, dict)
-            was_live = sub.get('was_live', False)
+            if profile_pic:
+                try:
+                    embed.set_thumbnail(url=profile_pic)
+                except:
+                    pass
             
-            if is_live and not was_live:
-                # Check filters - double check livestream is valid
-                if not livestream:
-                    continue
-                    
-                if not check_filters(sub, {'livestream': livestream}):
-                    print(f"🎯 Kick filtre engelledi: {username}")
-                    continue
-                
-                channel = bot.get_channel(sub['discord_channel_id'])
-                if channel:
-                    # Safely extract user data
-                    user_data = data.get('user') if data else {}
-                    if not isinstance(user_data, dict):
-                        user_data = {}
-                    
-                    # Safely get values with defaults
-                    display_username = user_data.get('username', username)
-                    session_title = livestream.get('session_title', 'Başlıksız')
-                    profile_pic = user_data.get('profile_pic')
-                    viewer_count = livestream.get('viewer_count', 0)
-                    
-                    embed = discord.Embed(
-                        title=get_text('live_now', sub.get('guild_id', 0), user=display_username),
-                        url=f"https://kick.com/{username}",
-                        description=f"**{session_title}**",
-                        color=0x53FC18
-                    )
-                    embed.set_author(name="Kick.com")
-                    
-                    if profile_pic:
-                        try:
-                            embed.set_thumbnail(url=profile_pic)
-                        except:
-                            pass
-                    
-                    # Safely get thumbnail
-                    thumbnail = livestream.get('thumbnail')
-                    if thumbnail and isinstance(thumbnail, dict):
-                        thumbnail_url = thumbnail.get('url')
-                        if thumbnail_url:
-                            try:
-                                embed.set_image(url=thumbnail_url)
-                            except:
-                                pass
-                    
-                    # Safely get categories
-                    categories = livestream.get('categories', [])
-                    if categories and isinstance(categories, list) and len(categories) > 0:
-                        category_name = categories[0].get('name', 'N/A') if isinstance(categories[0], dict) else 'N/A'
-                        embed.add_field(
-                            name=get_text('category', sub.get('guild_id', 0)),
-                            value=category_name,
-                            inline=True
-                        )
-                    
-                    embed.add_field(
-                        name=get_text('viewers', sub.get('guild_id', 0)),
-                        value=str(viewer_count),
-                        inline=True
-                    )
-                    embed.set_footer(text="Yayın başladı!")
-                    
-                    # Custom message
-                    embed = get_custom_embed(sub, embed)
-                    
-                    # Get mention
-                    mention = get_mention_string(sub.get('guild_id'), 'kick')
-                    
-                    await channel.send(f"{mention} `{username}` Kick'te yayın açtı!", embed=embed)
-                    
-                    # Play sound
-                    await play_notification_sound(sub.get('guild_id'))
-                    
-                    # Stats
-                    stats.add_notification('kick', username, channel.id)
-                    
-                    print(f"✅ Kick: {username}")
-                
-                # Update was_live status
-                for s in subscriptions:
-                    if s.get('type') == 'kick' and s.get('username') == username:
-                        s['was_live'] = True
-                await save_subscriptions(subscriptions)
+            # Safely get thumbnail
+            thumbnail = livestream.get('thumbnail')
+            if thumbnail and isinstance(thumbnail, dict):
+                thumbnail_url = thumbnail.get('url')
+                if thumbnail_url:
+                    try:
+                        embed.set_image(url=thumbnail_url)
+                    except:
+                        pass
+            
+            # Safely get categories
+            categories = livestream.get('categories', [])
+            category_name = ''
+            if categories and isinstance(categories, list) and len(categories) > 0:
+                category_name = categories[0].get('name', 'N/A') if isinstance(categories[0], dict) else 'N/A'
+                embed.add_field(
+                    name=template.category_label,
+                    value=category_name,
+                    inline=True
+                )
+            
+            embed.add_field(
+                name=template.viewers_label,
+                value=str(viewer_count),
+                inline=True
+            )
+            embed.set_footer(text="Yayın başladı!")
             
-            elif not is_live and was_live:
-                # Stream ended
-                for s in subscriptions:
-                    if s.get('type') == 'kick' and s.get('username') == username:
-                        s['was_live'] = False
-                await save_subscriptions(subscriptions)
-                print(f"🔵 Kick bitti: {username}")
+            # Custom message
+            embed = get_custom_embed(
+                sub, embed,
+                user=display_username, title=session_title, viewers=viewer_count,
+                category=category_name, link=f"https://kick.com/{username}"
+            )
+            
+            # Get mention
+            mention = template.mention
+            
+            # Delivery, sound and stats happen in the dispatcher
+            await notification_dispatcher.enqueue(
+                channel, f"{mention} `{username}` Kick'te yayın açtı!", embed,
+                sub.get('guild_id'), 'kick', username
+            )
             
-            # Small delay between Kick API requests to avoid rate limiting
-            if idx < len(kick_subs) - 1:
-                await asyncio.sleep(0.3)
+            print(f"✅ Kick: {username}")
+        
+        # Update was_live status (this subscriber only)
+        state_writer.mark(sub, was_live=True)
+        return True
     
-    except Exception as e:
-        print(f"❌ Kick genel hata: {e}")
-    finally:
-        if driver:
-            try:
-                await asyncio.to_thread(driver.quit)
-            except:
-                pass
+    elif not is_live and was_live:
+        # Stream ended
+        state_writer.mark(sub, was_live=False)
+        print(f"🔵 Kick bitti: {username}")
+        return True
+
+    return False
 
 # ==================== RSS/YOUTUBE CHECKER ====================
 async def check_rss_feeds(feed_subs):
-    # Batch processing with connection pooling
-    connector = aiohttp.TCPConnector(limit=config.MAX_CONCURRENT_CHECKS, limit_per_host=2)
-    timeout = aiohttp.ClientTimeout(total=config.REQUEST_TIMEOUT, connect=3)
-    
-    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-        # Process in batches to avoid overwhelming network
-        batch_size = config.MAX_CONCURRENT_CHECKS
-        for i in range(0, len(feed_subs), batch_size):
-            batch = feed_subs[i:i + batch_size]
-            tasks = [check_single_feed(session, sub) for sub in batch]
-            await asyncio.gather(*tasks, return_exceptions=True)
+    # Batch processing over the shared, long-lived connection pool
+    session = http_sessions.get()
+    
+    # Every feed URL is downloaded once and fanned out to all of its subscribers
+    sources = list(group_by_source(feed_subs).values())
+    
+    # Process in batches to avoid overwhelming network
+    batch_size = config.MAX_CONCURRENT_CHECKS
+    try:
+        for i in range(0, len(sources), batch_size):
+            batch = sources[i:i + batch_size]
+            tasks = [with_source_budget(check_feed_source(session, subs), subs[0]['url'][:50], subs[0]['type'])
+                     for subs in batch]
+            outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+            for subs, outcome in zip(batch, outcomes):
+                source_scheduler.record(source_key(subs[0]), outcome if isinstance(outcome, str) else 'error')
             
             # Small delay between batches to reduce network spike
-            if i + batch_size < len(feed_subs):
+            if i + batch_size < len(sources):
                 await asyncio.sleep(0.5)
+    finally:
+        # Also when the run is cut off, so the sources that did finish are remembered
+        await feed_cache.save()
+        seen_entries.save(get_registry().by_source)
+    if config.TEST_MODE:
+        print(f"📊 Feed cache: {feed_cache.hits} hit / {feed_cache.misses} miss")
+        print(f"📊 Feed parse: {feed_parse_stats['fast']} hızlı ({feed_parse_stats['early_stops']} erken durdu, "
+              f"{feed_parse_stats['fast_cpu'] * 1000:.1f}ms CPU) / {feed_parse_stats['fallback']} feedparser "
+              f"({feed_parse_stats['pool']} süreçte, {feed_parse_stats['fallback_cpu'] * 1000:.1f}ms CPU), "
+              f"{feed_parse_stats['bytes_read']} bayt okundu (+{feed_parse_stats['bytes_drained']} "
+              f"bağlantı için boşaltıldı), ~{feed_parse_stats['bytes_skipped']} bayt indirilmedi")
 
-async def check_single_feed(session, sub):
-    global _notified_entries
-    
+async def check_feed_source(session, subs) -> str:
+    """Fetch one feed URL, hand the new entries to every subscriber and return the poll outcome"""
+    url = subs[0]['url']
+    sub_type = subs[0]['type']
+    key = source_key(subs[0])
+    seen = seen_entries.get(key)
+    # No history for this source yet (first start after upgrading): the subscriber cursors mark the boundary
+    known = seen or {s['last_entry_id'] for s in subs if s.get('last_entry_id')}
     try:
         # Add headers to reduce response size
         headers = {
@@ -1054,208 +3595,260 @@ async def check_single_feed(session, sub):
             'Connection': 'keep-alive'
         }
         
-        async with session.get(sub['url'], headers=headers) as resp:
-            if resp.status != 200:
-                return
-            
-            content = await resp.text()
-            feed = await asyncio.to_thread(feedparser.parse, content)
-            
-            if not feed.entries:
-                return
-            
-            latest = feed.entries[0]
-            entry_id = latest.get('id') or latest.get('link')
-            
-            if not entry_id:
-                return
+        # New subscribers need a full document to record their first entry
+        needs_baseline = any(s.get('last_entry_id') is None for s in subs)
+        if not needs_baseline:
+            headers.update(feed_cache.request_headers(url))
+        
+        fetch_started = time_module.perf_counter()
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                metrics.fetch_duration.observe(time_module.perf_counter() - fetch_started, sub_type)
+                feed_cache.hits += 1
+                feed_cache.touch(url)
+                return 'idle'
             
-            sub_id = sub.get('id')
+            if resp.status != 200:
+                metrics.errors.inc(sub_type)
+                return 'error'
             
-            # Initialize notified entries set for this subscription
-            if sub_id not in _notified_entries:
-                _notified_entries[sub_id] = set()
+            response_headers = resp.headers
+            # Fast path: stream the body and stop at the first entry we already know
+            result = await read_feed(resp, url, known, config.FEED_MAX_NEW_ENTRIES if seen else None)
+        metrics.fetch_duration.observe(time_module.perf_counter() - fetch_started, sub_type)
+        
+        body_hash = None
+        if result['content'] is None:
+            feed_title, entries = result['title'], result['entries']
+        else:
+            content = result['content']
             
-            # Check if already notified in THIS session (memory check)
-            if entry_id in _notified_entries[sub_id]:
-                # Already notified in this session, skip silently
-                return
+            # Same bytes as last time: nothing new, skip parsing entirely
+            body_hash = hashlib.sha1(content).hexdigest()
+            if not needs_baseline and feed_cache.is_unchanged(url, body_hash):
+                feed_cache.hits += 1
+                feed_cache.update(url, response_headers)
+                return 'idle'
             
-            # First run: just save the ID, don't notify
-            if sub.get('last_entry_id') is None:
-                subscriptions = load_subscriptions()
-                for s in subscriptions:
-                    if s.get('id') == sub.get('id'):
-                        s['last_entry_id'] = entry_id
-                await save_subscriptions(subscriptions)
-                _notified_entries[sub_id].add(entry_id)
+            with metrics.parse_duration.time('feedparser'):
+                feed_title, entries, cpu = await feed_parse_pool.parse(content)
+            feed_parse_stats['fallback'] += 1
+            feed_parse_stats['fallback_cpu'] += cpu
+        
+        feed_cache.misses += 1
+        if not entries:
+            feed_cache.update(url, response_headers, body_hash)
+            return 'idle'
+    
+    except asyncio.TimeoutError:
+        metrics.timeouts.inc(sub_type)
+        print(f"⏱️ Timeout: {url[:50]}")
+        return 'error'
+    except Exception as e:
+        metrics.errors.inc(sub_type)
+        print(f"❌ Feed ({url[:30]}): {e}")
+        return 'error'
+    
+    new_entries = diff_feed_entries(seen, known, entries)
+    new_entries.reverse()  # Notify oldest first
+    
+    results = [await check_single_feed(sub, feed_title, new_entries, entries[0]['id']) for sub in subs]
+    
+    # Only remember this version once every subscriber handled it, otherwise retry next cycle
+    if all(results):
+        seen_entries.add(key, [entry['id'] for entry in entries if entry['id']])
+        feed_cache.update(url, response_headers, body_hash)
+        return 'activity' if new_entries else 'idle'
+    return 'error'
+
+def diff_feed_entries(seen: Optional[OrderedDict], known, entries: list) -> list:
+    """Entries above the first already known id, newest first"""
+    new_entries = []
+    for entry in entries:
+        if not entry['id']:
+            continue
+        if entry['id'] in known:
+            break
+        new_entries.append(entry)
+    else:
+        if not seen:
+            # No cursor found in the document: take it as the baseline instead of a flood
+            return []
+    
+    return new_entries[:config.FEED_MAX_NEW_ENTRIES]
+
+async def check_single_feed(sub, feed_title: Optional[str], new_entries: list, latest_id: Optional[str]) -> bool:
+    try:
+        # First run: just save the newest ID, don't notify
+        if sub.get('last_entry_id') is None:
+            if latest_id:
+                state_writer.mark(sub, last_entry_id=latest_id)
                 print(f"ℹ️ İlk çalıştırma: {sub['type'].upper()} {sub.get('id', 'N/A')[:30]} → ID kaydedildi")
-                return
-            
-            # Check if this is actually a NEW entry (strict comparison)
-            if sub['last_entry_id'] == entry_id:
-                # Already notified, add to cache and skip
-                _notified_entries[sub_id].add(entry_id)
-                return
-            
-            # Double-check: Make sure the entry is recent (not older than 24 hours)
-            if 'published_parsed' in latest:
-                import time
-                entry_time = time.mktime(latest.published_parsed)
-                current_time = time.time()
-                age_hours = (current_time - entry_time) / 3600
-                
-                if age_hours > 24:
-                    # Entry is too old, just update ID without notifying
-                    subscriptions = load_subscriptions()
-                    for s in subscriptions:
-                        if s.get('id') == sub.get('id'):
-                            s['last_entry_id'] = entry_id
-                    await save_subscriptions(subscriptions)
-                    _notified_entries[sub_id].add(entry_id)
-                    print(f"⏰ Eski içerik atlandı: {latest.title[:30]} ({age_hours:.1f} saat)")
-                    return
+            return True
+        
+        # A retry after a partial failure: skip what this subscriber already got
+        new_ids = [entry['id'] for entry in new_entries]
+        if sub['last_entry_id'] in new_ids:
+            skipped = new_ids.index(sub['last_entry_id']) + 1
+            metrics.duplicates.inc(sub['type'], amount=skipped)
+            new_entries = new_entries[skipped:]
+        
+        channel = bot.get_channel(sub['discord_channel_id'])
+        for latest in new_entries:
+            await notify_feed_entry(sub, feed_title, latest, channel)
             
-            # Triple-check: Already in notified cache?
-            if entry_id in _notified_entries[sub_id]:
-                print(f"🔁 Duplicate önlendi: {latest.title[:30]}")
-                return
+            # Advance the cursor entry by entry, oldest first
+            state_writer.mark(sub, last_entry_id=latest['id'])
+        
+        return True
+    
+    except Exception as e:
+        print(f"❌ Feed ({sub.get('id', 'N/A')[:30]}): {e}")
+        return False
+
+async def notify_feed_entry(sub, feed_title: Optional[str], latest: dict, channel):
+    # Make sure the entry is recent (not older than 24 hours)
+    if latest['published']:
+        age_hours = (time_module.time() - latest['published']) / 3600
+        if age_hours > 24:
+            print(f"⏰ Eski içerik atlandı: {latest['title'][:30]} ({age_hours:.1f} saat)")
+            return
+    
+    # Check filters
+    if not check_filters(sub, {'title': latest['title']}):
+        print(f"🎯 {sub['type'].upper()} filtre engelledi: {latest['title'][:30]}")
+        return
+    
+    if channel:
+        is_youtube = sub['type'] == 'youtube'
+        
+        embed = discord.Embed(
+            title=f"{'🎥' if is_youtube else '📰'} {latest['title']}"[:256],  # Discord's embed title limit
+            url=latest['link'],
+            description=f"**{feed_title or 'Yeni İçerik'}**",
+            color=discord.Color.red() if is_youtube else discord.Color.green()
+        )
+        
+        if latest['author']:
+            embed.set_author(name=latest['author'])
+        
+        if latest['thumbnail']:
+            embed.set_image(url=latest['thumbnail'])
+        
+        # Custom message
+        embed = get_custom_embed(
+            sub, embed,
+            user=latest['author'] or feed_title, title=latest['title'], link=latest['link']
+        )
+        
+        # Get mention
+        mention = get_mention_string(sub.get('guild_id'), sub['type'])
+        
+        # QUEUE MESSAGE (delivery, sound and stats happen in the dispatcher)
+        await notification_dispatcher.enqueue(
+            channel, f"{mention}", embed, sub.get('guild_id'), sub['type'], latest['title']
+        )
+        
+        print(f"✅ {sub['type'].upper()}: {latest['title'][:50]}")
+
+# ==================== TWITTER CHECKER ====================
+async def check_twitter_accounts(twitter_subs):
+    groups = group_by_source(twitter_subs)
+    
+    # Cached handle -> id; unknown handles are resolved in one batched lookup
+    users = await twitter_client.resolve_users([subs[0]['username'] for subs in groups.values()])
+    
+    # One timeline request per account, shared by everyone following it (bounded in the client)
+    await asyncio.gather(*[
+        with_source_budget(check_twitter_source(key, subs, users.get(subs[0]['username'])), subs[0]['username'], 'twitter')
+        for key, subs in groups.items()
+    ], return_exceptions=True)
+
+async def check_twitter_source(key: str, subs: list, user):
+    username = subs[0]['username']
+    try:
+        if user is None:
+            # Unknown handle, or the lookup is rate limited: come back after the reset
+            source_scheduler.record(key, 'error', retry_at=twitter_client.retry_at('users'))
+            return
+        
+        # Fetch from the oldest cursor so every subscriber gets its own new tweets
+        cursors = [s.get('last_tweet_id') for s in subs]
+        since_id = None if None in cursors else min(int(c) for c in cursors)
+        tweets = await twitter_client.get_timeline(user, since_id)
+        
+        if tweets is None:
+            retry_at = twitter_client.retry_at('timeline')
+            # Out of requests is not the account's fault: idle until the reset instead of an error
+            source_scheduler.record(key, 'idle' if retry_at else 'error', retry_at=retry_at)
+            return
+        if not tweets:
+            source_scheduler.record(key, 'idle')
+            return
+    except Exception as e:
+        print(f"❌ Twitter (@{username}): {e}")
+        source_scheduler.record(key, 'error')
+        return
+    
+    data = {'user': user, 'tweets': tweets}
+    for sub in subs:
+        await notify_twitter_subscriber(sub, data)
+    source_scheduler.record(key, 'activity')
+
+async def notify_twitter_subscriber(sub, data):
+    try:
+        username = sub['username']
+        last_tweet_id = sub.get('last_tweet_id')
+        
+        for tweet in reversed(data['tweets']):  # Oldest first
+            if last_tweet_id and int(tweet.id) <= int(last_tweet_id):
+                metrics.duplicates.inc('twitter')
+                continue
             
             # Check filters
-            if not check_filters(sub, {'title': latest.title}):
-                print(f"🎯 {sub['type'].upper()} filtre engelledi: {latest.title[:30]}")
-                # Update ID but don't notify
-                subscriptions = load_subscriptions()
-                for s in subscriptions:
-                    if s.get('id') == sub.get('id'):
-                        s['last_entry_id'] = entry_id
-                await save_subscriptions(subscriptions)
-                _notified_entries[sub_id].add(entry_id)
-                return
+            if not check_filters(sub, {'title': tweet.text}):
+                print(f"🎯 Twitter filtre engelledi: @{username}")
+                continue
             
             channel = bot.get_channel(sub['discord_channel_id'])
             if channel:
-                is_youtube = sub['type'] == 'youtube'
-                
                 embed = discord.Embed(
-                    title=f"{'🎥' if is_youtube else '📰'} {latest.title}",
-                    url=latest.link,
-                    description=f"**{feed.feed.get('title', 'Yeni İçerik')}**",
-                    color=discord.Color.red() if is_youtube else discord.Color.green()
+                    title=f"🐦 @{username}",
+                    url=f"https://twitter.com/{username}/status/{tweet.id}",
+                    description=tweet.text[:500],
+                    color=0x1DA1F2
                 )
                 
-                if 'author' in latest:
-                    embed.set_author(name=latest.author)
-                
-                img_url = None
-                if 'media_thumbnail' in latest and latest.media_thumbnail:
-                    img_url = latest.media_thumbnail[0].get('url')
-                elif 'summary' in latest:
-                    match = re.search(r'<img[^>]+src="([^">]+)"', latest.summary)
-                    if match:
-                        img_url = match.group(1)
+                if data['user'].profile_image_url:
+                    embed.set_thumbnail(url=data['user'].profile_image_url)
                 
-                if img_url:
-                    embed.set_image(url=img_url)
+                embed.set_footer(text=f"Twitter • {tweet.created_at.strftime('%H:%M')}")
                 
                 # Custom message
-                embed = get_custom_embed(sub, embed)
+                embed = get_custom_embed(
+                    sub, embed,
+                    user=username, title=tweet.text[:200], link=f"https://twitter.com/{username}/status/{tweet.id}"
+                )
                 
                 # Get mention
-                mention = get_mention_string(sub.get('guild_id'), sub['type'])
+                mention = get_mention_string(sub.get('guild_id'), 'twitter')
                 
-                # SEND MESSAGE
-                await channel.send(f"{mention}", embed=embed)
-                
-                # Mark as notified IMMEDIATELY after sending
-                _notified_entries[sub_id].add(entry_id)
-                
-                # Play sound
-                await play_notification_sound(sub.get('guild_id'))
-                
-                # Stats
-                stats.add_notification(sub['type'], latest.title, channel.id)
+                # Delivery, sound and stats happen in the dispatcher
+                await notification_dispatcher.enqueue(
+                    channel, f"{mention}", embed, sub.get('guild_id'), 'twitter', f"@{username}"
+                )
                 
-                print(f"✅ {sub['type'].upper()}: {latest.title[:50]}")
+                print(f"✅ Twitter: @{username}")
             
-            # Update last_entry_id ONLY AFTER successful notification
-            subscriptions = load_subscriptions()
-            for s in subscriptions:
-                if s.get('id') == sub.get('id'):
-                    s['last_entry_id'] = entry_id
-            await save_subscriptions(subscriptions)
-            
-            # Keep cache size reasonable (max 100 entries per sub)
-            if len(_notified_entries[sub_id]) > 100:
-                # Keep only the 50 most recent
-                _notified_entries[sub_id] = set(list(_notified_entries[sub_id])[-50:])
+            # Update last tweet
+            state_writer.mark(sub, last_tweet_id=tweet.id)
     
-    except asyncio.TimeoutError:
-        print(f"⏱️ Timeout: {sub.get('url', 'N/A')[:50]}")
     except Exception as e:
-        print(f"❌ Feed ({sub.get('id', 'N/A')[:30]}): {e}")
-
-# ==================== TWITTER CHECKER ====================
-async def check_twitter_accounts(twitter_subs):
-    for sub in twitter_subs:
-        try:
-            username = sub['username']
-            data = await twitter_client.get_user_tweets(username, sub.get('last_tweet_id'))
-            
-            if not data or not data['tweets']:
-                continue
-            
-            subscriptions = load_subscriptions()
-            
-            for tweet in reversed(data['tweets']):  # Oldest first
-                if sub.get('last_tweet_id') and tweet.id == sub.get('last_tweet_id'):
-                    continue
-                
-                # Check filters
-                if not check_filters(sub, {'title': tweet.text}):
-                    print(f"🎯 Twitter filtre engelledi: @{username}")
-                    continue
-                
-                channel = bot.get_channel(sub['discord_channel_id'])
-                if channel:
-                    embed = discord.Embed(
-                        title=f"🐦 @{username}",
-                        url=f"https://twitter.com/{username}/status/{tweet.id}",
-                        description=tweet.text[:500],
-                        color=0x1DA1F2
-                    )
-                    
-                    if hasattr(data['user'], 'profile_image_url'):
-                        embed.set_thumbnail(url=data['user'].profile_image_url)
-                    
-                    embed.set_footer(text=f"Twitter • {tweet.created_at.strftime('%H:%M')}")
-                    
-                    # Custom message
-                    embed = get_custom_embed(sub, embed)
-                    
-                    # Get mention
-                    mention = get_mention_string(sub.get('guild_id'), 'twitter')
-                    
-                    await channel.send(f"{mention}", embed=embed)
-                    
-                    # Play sound
-                    await play_notification_sound(sub.get('guild_id'))
-                    
-                    # Stats
-                    stats.add_notification('twitter', f"@{username}", channel.id)
-                    
-                    print(f"✅ Twitter: @{username}")
-                
-                # Update last tweet
-                for s in subscriptions:
-                    if s.get('id') == sub.get('id'):
-                        s['last_tweet_id'] = tweet.id
-                await save_subscriptions(subscriptions)
-        
-        except Exception as e:
-            print(f"❌ Twitter (@{sub.get('username', 'N/A')}): {e}")
+        print(f"❌ Twitter (@{sub.get('username', 'N/A')}): {e}")
 
 # ==================== RUN BOT ====================
+startup_profile.mark('module init')
+
 if __name__ == "__main__":
     if not config.TOKEN:
         print("❌ DISCORD_TOKEN bulunamadı!")
@@ -0,0 +1,35 @@
+"""feedparser fallback for bot.py, kept apart so spawned parse workers only import this file"""
+import calendar
+import re
+import time
+
+IMG_SRC_RE = re.compile(r'<img[^>]+src="([^">]+)"')
+
+def summarize_entry(entry) -> dict:
+    """Compact form of a feedparser entry, same shape as FeedStreamParser produces"""
+    thumbnail = None
+    if entry.get('media_thumbnail'):
+        thumbnail = entry.media_thumbnail[0].get('url')
+    elif entry.get('summary'):
+        match = IMG_SRC_RE.search(entry.summary)
+        if match:
+            thumbnail = match.group(1)
+    published = entry.get('published_parsed')
+    return {
+        'id': entry.get('id') or entry.get('link'),
+        'title': entry.get('title', ''),
+        'link': entry.get('link'),
+        'author': entry.get('author'),
+        'published': calendar.timegm(published) if published else None,
+        'thumbnail': thumbnail
+    }
+
+def parse_feed_document(content: bytes):
+    """Fallback for documents the streaming parser rejects; returns (feed title, entry summaries, CPU seconds).
+    
+    Only plain, picklable data is returned so it can run in a worker process."""
+    import feedparser  # Only needed for feeds the streaming parser rejects
+    started = time.thread_time()
+    feed = feedparser.parse(content)
+    entries = [summarize_entry(entry) for entry in feed.entries]
+    return feed.feed.get('title'), entries, time.thread_time() - started